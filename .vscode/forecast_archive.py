@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Append-only columnar archive of fetched hourly forecasts (needs NumPy).
+
+Each column is a flat binary file of fixed-width values, one row per
+forecast hour, so appending is a write at the end of each file and reading
+is a np.memmap with no parsing at all:
+
+    time.i8         forecast hour, seconds since the epoch (UTC)
+    temperature.f4  temperature_2m in °C (NaN where the API had none)
+    location.i4     index into meta.json "locations"
+    fetched_at.i8   when the forecast was fetched, seconds since the epoch
+
+meta.json holds the committed row count, written after the columns, so a
+crash mid-append leaves a tail that readers ignore and the next append
+overwrites. Query it with:
+
+    python forecast_archive.py query --location London --since 2026-10-01
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+ARCHIVE_DIR = Path(
+    os.environ.get("WEATHER_ARCHIVE_DIR")
+    or Path.home() / ".local" / "share" / "pypractice-weather" / "archive"
+)
+COLUMNS = {
+    "time": np.dtype("<i8"),
+    "temperature": np.dtype("<f4"),
+    "location": np.dtype("<i4"),
+    "fetched_at": np.dtype("<i8"),
+}
+_SUFFIX = {"<i8": "i8", "<f4": "f4", "<i4": "i4"}
+
+
+def hourly_arrays(payload: Dict[str, Any]) -> tuple[np.ndarray, np.ndarray]:
+    """(UTC epoch seconds, float32 temperatures) from a forecast's hourly block."""
+    hourly = payload.get("hourly") or {}
+    stamps = hourly.get("time") or []
+    values = hourly.get("temperature_2m") or []
+    count = min(len(stamps), len(values))
+    # Times are local wall-clock time; utc_offset_seconds turns them into UTC.
+    local = np.array(stamps[:count], dtype="datetime64[s]").astype(np.int64)
+    times = local - int(payload.get("utc_offset_seconds") or 0)
+    temps = np.array(
+        [np.nan if v is None else v for v in values[:count]], dtype=np.float32
+    )
+    return times, temps
+
+
+@dataclass
+class Summary:
+    """Temperature statistics for one location over the queried range."""
+
+    location: str
+    hours: int
+    minimum: float
+    maximum: float
+    mean: float
+    first: int
+    last: int
+
+
+class ForecastArchive:
+    def __init__(self, directory: Path = ARCHIVE_DIR) -> None:
+        self.directory = directory
+
+    def _path(self, column: str) -> Path:
+        return self.directory / f"{column}.{_SUFFIX[COLUMNS[column].str]}"
+
+    def _meta(self) -> Dict[str, Any]:
+        try:
+            with (self.directory / "meta.json").open(encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return {"rows": 0, "locations": []}
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        path = self.directory / "meta.json"
+        tmp = path.with_name(f"meta.json.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # One writer at a time across processes (no-op where fcntl is missing).
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with (self.directory / "lock").open("w") as fh:
+            try:
+                import fcntl
+            except ImportError:
+                yield
+                return
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def append(
+        self,
+        *,
+        name: str,
+        latitude: float,
+        longitude: float,
+        times: np.ndarray,
+        temps: np.ndarray,
+        fetched_at: Optional[float] = None,
+    ) -> int:
+        """Append one fetched series; returns the number of rows written.
+
+        `name` labels the location in queries, e.g. "London, United Kingdom".
+        """
+        if not len(times):
+            return 0
+        fetched = int(time.time() if fetched_at is None else fetched_at)
+        with self._locked():
+            meta = self._meta()
+            key = [name, round(latitude, 4), round(longitude, 4)]
+            if key not in meta["locations"]:
+                meta["locations"].append(key)
+            location = meta["locations"].index(key)
+            rows = meta["rows"]
+            values = {
+                "time": times,
+                "temperature": temps,
+                "location": np.full(len(times), location),
+                "fetched_at": np.full(len(times), fetched),
+            }
+            for column, dtype in COLUMNS.items():
+                with self._path(column).open("ab") as fh:
+                    # Drop an uncommitted tail left by an interrupted append.
+                    fh.truncate(rows * dtype.itemsize)
+                    data = np.ascontiguousarray(values[column], dtype=dtype)
+                    fh.write(data.tobytes())
+            meta["rows"] = rows + len(times)
+            self._write_meta(meta)
+        return len(times)
+
+    def columns(self) -> tuple[Dict[str, np.ndarray], List[str]]:
+        """Read-only memory maps of every column, plus the location names."""
+        meta = self._meta()
+        rows = meta["rows"]
+        columns = {}
+        for column, dtype in COLUMNS.items():
+            if rows:
+                columns[column] = np.memmap(
+                    self._path(column), dtype=dtype, mode="r", shape=(rows,)
+                )
+            else:
+                columns[column] = np.empty(0, dtype=dtype)
+        return columns, [name for name, _, _ in meta["locations"]]
+
+    def summarize(
+        self,
+        *,
+        location: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        latest_only: bool = True,
+    ) -> List[Summary]:
+        """Min/max/mean temperature per location for hours in [since, until).
+
+        With `latest_only`, an hour forecast by several fetches counts once,
+        using the most recent fetch.
+        """
+        columns, names = self.columns()
+        times = columns["time"]
+        locations = columns["location"]
+        mask = np.ones(len(times), dtype=bool)
+        if since is not None:
+            mask &= times >= since
+        if until is not None:
+            mask &= times < until
+        if location is not None:
+            query = location.lower()
+            wanted = [
+                i
+                for i, name in enumerate(names)
+                if name.lower() == query or name.lower().startswith(query + ",")
+            ]
+            mask &= np.isin(locations, wanted)
+        rows = np.flatnonzero(mask)
+        times = times[rows]
+        locations = locations[rows]
+        temps = columns["temperature"][rows]
+        fetched = columns["fetched_at"][rows]
+        # Sort by location, then hour, then fetch time: the last row of each
+        # (location, hour) run is the newest forecast for that hour.
+        order = np.lexsort((fetched, times, locations))
+        locations, times, temps = locations[order], times[order], temps[order]
+        if latest_only and len(order):
+            last = np.ones(len(order), dtype=bool)
+            last[:-1] = (locations[1:] != locations[:-1]) | (times[1:] != times[:-1])
+            locations, times, temps = locations[last], times[last], temps[last]
+        valid = ~np.isnan(temps)
+        locations, times, temps = locations[valid], times[valid], temps[valid]
+        if not len(temps):
+            return []
+        starts = np.flatnonzero(np.r_[True, locations[1:] != locations[:-1]])
+        counts = np.diff(np.r_[starts, len(temps)])
+        sums = np.add.reduceat(temps.astype(np.float64), starts)
+        return [
+            Summary(
+                location=names[locations[start]],
+                hours=int(count),
+                minimum=float(low),
+                maximum=float(high),
+                mean=float(total / count),
+                first=int(first),
+                last=int(final),
+            )
+            for start, count, low, high, total, first, final in zip(
+                starts,
+                counts,
+                np.minimum.reduceat(temps, starts),
+                np.maximum.reduceat(temps, starts),
+                sums,
+                np.minimum.reduceat(times, starts),
+                np.maximum.reduceat(times, starts),
+            )
+        ]
+
+
+def _epoch(day: Optional[str]) -> Optional[int]:
+    if day is None:
+        return None
+    moment = datetime.fromisoformat(day)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def _stamp(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def main(argv: list[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--dir", type=Path, default=ARCHIVE_DIR, help="Archive directory."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    query = sub.add_parser("query", help="Temperature statistics per location.")
+    query.add_argument("--location", help="Only this location name.")
+    query.add_argument("--since", help="Start date/time (ISO, UTC), inclusive.")
+    query.add_argument("--until", help="End date/time (ISO, UTC), exclusive.")
+    query.add_argument(
+        "--all-fetches",
+        action="store_true",
+        help="Count every fetched forecast of an hour, not only the newest.",
+    )
+    sub.add_parser("info", help="Row count, locations and size on disk.")
+    args = parser.parse_args(argv)
+    archive = ForecastArchive(args.dir)
+
+    if args.command == "info":
+        columns, names = archive.columns()
+        size = sum(p.stat().st_size for p in args.dir.glob("*") if p.is_file())
+        print(f"{args.dir}: {len(columns['time'])} rows, {size / 1024:.1f} KiB")
+        for name in names:
+            print(f"  {name}")
+        return 0
+
+    try:
+        since, until = _epoch(args.since), _epoch(args.until)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    summaries = archive.summarize(
+        location=args.location,
+        since=since,
+        until=until,
+        latest_only=not args.all_fetches,
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if not summaries:
+        print("No archived forecasts match.", file=sys.stderr)
+        return 1
+    print(
+        f"{'Location':<24} {'Hours':>6} {'Min':>6} {'Max':>6} {'Mean':>6}"
+        f"  {'From (UTC)':<16}  {'To (UTC)'}"
+    )
+    for s in summaries:
+        print(
+            f"{s.location[:24]:<24} {s.hours:>6} {s.minimum:>6.1f} {s.maximum:>6.1f}"
+            f" {s.mean:>6.1f}  {_stamp(s.first)}  {_stamp(s.last)}"
+        )
+    print(f"({elapsed:.1f}ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Offline city gazetteer: geocoding and autocomplete without the network.
+
+Places are kept sorted by a normalized name key, so an exact lookup or a
+prefix search is a pair of bisections; a second sorted index keyed by
+country code first serves country-filtered queries the same way. The
+bundled cities.csv covers major cities worldwide; a GeoNames dump
+(e.g. cities15000.txt from download.geonames.org) can replace it:
+
+    python gazetteer.py import cities15000.txt
+    python gazetteer.py complete "san " --country US
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import heapq
+import os
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+GAZETTEER_PATH = Path(
+    os.environ.get("WEATHER_GAZETTEER") or Path(__file__).with_name("cities.csv")
+)
+COLUMNS = (
+    "key",
+    "name",
+    "country_code",
+    "country",
+    "latitude",
+    "longitude",
+    "population",
+)
+# Sorts after any character a normalized key can contain.
+_MAX_CHAR = "\U0010ffff"
+
+
+def normalize(name: str) -> str:
+    """Case- and accent-insensitive key: "Düsseldorf " -> "dusseldorf"."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+class Place(NamedTuple):
+    name: str
+    country_code: str
+    country: str
+    latitude: float
+    longitude: float
+    population: int
+
+
+class Gazetteer:
+    """Sorted-array indexes over places; most populous first per name."""
+
+    def __init__(
+        self, places: Iterable[Place], keys: Optional[Iterable[str]] = None
+    ) -> None:
+        places = list(places)
+        # A saved file carries its keys, which skips normalizing every name.
+        keys = list(keys) if keys is not None else [normalize(p.name) for p in places]
+        order = sorted(
+            range(len(places)), key=lambda i: (keys[i], -places[i].population)
+        )
+        self._keys = [keys[i] for i in order]
+        self._places = [places[i] for i in order]
+        by_country = sorted(
+            (f"{place.country_code}\0{key}", i)
+            for i, (key, place) in enumerate(zip(self._keys, self._places))
+        )
+        self._country_keys = [key for key, _ in by_country]
+        self._country_rows = [i for _, i in by_country]
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    @classmethod
+    def load(cls, path: Path = GAZETTEER_PATH) -> "Gazetteer":
+        with path.open(encoding="utf-8", newline="") as fh:
+            reader = csv.reader(fh)
+            if tuple(next(reader, ())) != COLUMNS:
+                raise ValueError(f"{path} is not a gazetteer file")
+            keys, places = [], []
+            for key, name, code, country, lat, lon, population in reader:
+                keys.append(key or normalize(name))
+                places.append(
+                    Place(name, code, country, float(lat), float(lon), int(population))
+                )
+        return cls(places, keys)
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(f"{path.name}.tmp")
+        with tmp.open("w", encoding="utf-8", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(COLUMNS)
+            for key, p in zip(self._keys, self._places):
+                writer.writerow(
+                    [
+                        key,
+                        p.name,
+                        p.country_code,
+                        p.country,
+                        p.latitude,
+                        p.longitude,
+                        p.population,
+                    ]
+                )
+        os.replace(tmp, path)
+
+    def _rows(
+        self, start: str, stop: str, country: Optional[str]
+    ) -> range | List[int]:
+        # Indexes into self._places whose key lies in [start, stop).
+        if country is None:
+            lo = bisect.bisect_left(self._keys, start)
+            return range(lo, bisect.bisect_left(self._keys, stop, lo))
+        prefix = f"{country.upper()}\0"
+        lo = bisect.bisect_left(self._country_keys, prefix + start)
+        hi = bisect.bisect_left(self._country_keys, prefix + stop, lo)
+        return self._country_rows[lo:hi]
+
+    def lookup(self, name: str, country: Optional[str] = None) -> Optional[Place]:
+        """The most populous place named exactly `name` (ignoring case/accents)."""
+        key = normalize(name)
+        rows = self._rows(key, key + "\0", country)
+        # Rows are in (key, -population) order, so the first is the largest.
+        return self._places[rows[0]] if rows else None
+
+    def complete(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> List[Place]:
+        """Up to `limit` places whose name starts with `prefix`, largest first."""
+        start = normalize(prefix)
+        rows = self._rows(start, start + _MAX_CHAR, country)
+        places = self._places
+        best = heapq.nlargest(limit, rows, key=lambda i: places[i].population)
+        return [places[i] for i in best]
+
+
+def import_geonames(
+    path: Path, *, min_population: int, country_names: Dict[str, str]
+) -> List[Place]:
+    """Read populated places from a GeoNames tab-separated dump."""
+    places = []
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            cols = line.rstrip("\n").split("\t")
+            # geonameid, name, asciiname, alternatenames, latitude, longitude,
+            # feature class, feature code, country code, ..., population (14)
+            if len(cols) < 15 or cols[6] != "P":
+                continue
+            population = int(cols[14] or 0)
+            if population < min_population:
+                continue
+            code = cols[8]
+            places.append(
+                Place(
+                    cols[1],
+                    code,
+                    country_names.get(code, code),
+                    float(cols[4]),
+                    float(cols[5]),
+                    population,
+                )
+            )
+    return places
+
+
+def install_completer(gazetteer: Gazetteer, country: Optional[str] = None) -> bool:
+    """Tab-complete city names at input() prompts; False if readline is missing."""
+    try:
+        import readline
+    except ImportError:
+        return False
+    matches: List[str] = []
+
+    def complete(text: str, state: int) -> Optional[str]:
+        if state == 0:
+            names = (p.name for p in gazetteer.complete(text, country, limit=20))
+            matches[:] = list(dict.fromkeys(names))
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer_delims("")  # complete the whole line, spaces included
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
+    return True
+
+
+def main(argv: list[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--data", type=Path, default=GAZETTEER_PATH, help="Gazetteer CSV to use."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    lookup = sub.add_parser("lookup", help="Resolve an exact city name.")
+    lookup.add_argument("name")
+    lookup.add_argument("--country", help="ISO country code filter.")
+    complete = sub.add_parser("complete", help="List cities starting with a prefix.")
+    complete.add_argument("prefix")
+    complete.add_argument("--country", help="ISO country code filter.")
+    complete.add_argument("--limit", type=int, default=10)
+    imp = sub.add_parser("import", help="Replace the data with a GeoNames dump.")
+    imp.add_argument("dump", type=Path, help="e.g. cities15000.txt")
+    imp.add_argument("--min-population", type=int, default=15000)
+    sub.add_parser("bench", help="Time lookups and completions.")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        gazetteer = Gazetteer.load(args.data)
+    except OSError as exc:
+        if args.command != "import":
+            print(f"Error: {exc}", file=sys.stderr)
+            return 1
+        gazetteer = Gazetteer([])
+    load_ms = (time.perf_counter() - start) * 1000
+
+    if args.command == "import":
+        # Keep the readable country names the current data already has.
+        names = {p.country_code: p.country for p in gazetteer._places}
+        try:
+            places = import_geonames(
+                args.dump, min_population=args.min_population, country_names=names
+            )
+        except (OSError, ValueError) as exc:
+            print(f"Error: cannot import {args.dump}: {exc}", file=sys.stderr)
+            return 1
+        Gazetteer(places).save(args.data)
+        print(f"Wrote {len(places)} places to {args.data}")
+        return 0
+    if args.command == "lookup":
+        place = gazetteer.lookup(args.name, args.country)
+        if place is None:
+            print(f"No offline match for {args.name!r}", file=sys.stderr)
+            return 1
+        print(f"{place.name}, {place.country} ({place.latitude}, {place.longitude})")
+        return 0
+    if args.command == "complete":
+        for place in gazetteer.complete(args.prefix, args.country, args.limit):
+            print(f"{place.name}, {place.country_code}  pop {place.population:,}")
+        return 0
+
+    queries = ["London", "san", "New York", "b", "zzz"]
+    print(f"Loaded {len(gazetteer)} places in {load_ms:.1f}ms")
+    for label, call in (
+        ("lookup", lambda q: gazetteer.lookup(q)),
+        ("lookup --country US", lambda q: gazetteer.lookup(q, "US")),
+        ("complete", lambda q: gazetteer.complete(q)),
+    ):
+        rounds = 2000
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for query in queries:
+                call(query)
+        per_call = (time.perf_counter() - start) / (rounds * len(queries)) * 1e6
+        print(f"{label:<22} {per_call:6.1f}us per call")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Open-Meteo geocoding and forecast APIs.
+
+Serves payloads shaped like the real ones (recorded for a few cities,
+synthesized deterministically for any other name) with configurable latency,
+error rate and payload size, so weather.py can be benchmarked and tested
+without a network:
+
+    python mock_open_meteo.py --port 8765 --latency 40 --error-rate 0.05
+    python weather.py --api-base http://127.0.0.1:8765 London
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# Trimmed from real geocoding responses.
+RECORDED_PLACES: Dict[str, Dict[str, Any]] = {
+    "london": {
+        "id": 2643743,
+        "name": "London",
+        "latitude": 51.50853,
+        "longitude": -0.12574,
+        "elevation": 25.0,
+        "feature_code": "PPLC",
+        "country_code": "GB",
+        "timezone": "Europe/London",
+        "population": 7556900,
+        "country": "United Kingdom",
+        "admin1": "England",
+    },
+    "paris": {
+        "id": 2988507,
+        "name": "Paris",
+        "latitude": 48.85341,
+        "longitude": 2.3488,
+        "elevation": 42.0,
+        "feature_code": "PPLC",
+        "country_code": "FR",
+        "timezone": "Europe/Paris",
+        "population": 2138551,
+        "country": "France",
+        "admin1": "Île-de-France",
+    },
+    "berlin": {
+        "id": 2950159,
+        "name": "Berlin",
+        "latitude": 52.52437,
+        "longitude": 13.41053,
+        "elevation": 74.0,
+        "feature_code": "PPLC",
+        "country_code": "DE",
+        "timezone": "Europe/Berlin",
+        "population": 3426354,
+        "country": "Germany",
+        "admin1": "Land Berlin",
+    },
+    "new york": {
+        "id": 5128581,
+        "name": "New York",
+        "latitude": 40.71427,
+        "longitude": -74.00597,
+        "elevation": 10.0,
+        "feature_code": "PPL",
+        "country_code": "US",
+        "timezone": "America/New_York",
+        "population": 8175133,
+        "country": "United States",
+        "admin1": "New York",
+    },
+    "tokyo": {
+        "id": 1850147,
+        "name": "Tokyo",
+        "latitude": 35.6895,
+        "longitude": 139.69171,
+        "elevation": 44.0,
+        "feature_code": "PPLC",
+        "country_code": "JP",
+        "timezone": "Asia/Tokyo",
+        "population": 8336599,
+        "country": "Japan",
+        "admin1": "Tokyo",
+    },
+}
+CURRENT_UNITS = {
+    "time": "iso8601",
+    "interval": "seconds",
+    "temperature_2m": "°C",
+    "apparent_temperature": "°C",
+    "weather_code": "wmo code",
+    "relative_humidity_2m": "%",
+    "wind_speed_10m": "km/h",
+}
+
+
+def _seed(*parts: Any) -> int:
+    key = "|".join(str(part) for part in parts).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+
+def geocode_payload(name: str, country: Optional[str], strict: bool) -> Dict[str, Any]:
+    place = RECORDED_PLACES.get(name.strip().lower())
+    if place is None and not strict:
+        rng = random.Random(_seed(name.lower(), country))
+        place = {
+            "id": rng.randrange(10**6, 10**7),
+            "name": name.strip().title(),
+            "latitude": round(rng.uniform(-60, 70), 5),
+            "longitude": round(rng.uniform(-180, 180), 5),
+            "elevation": float(rng.randrange(0, 2000)),
+            "feature_code": "PPL",
+            "country_code": (country or "ZZ").upper(),
+            "timezone": "GMT",
+            "population": rng.randrange(1000, 10**6),
+            "country": "Mockland",
+        }
+    payload: Dict[str, Any] = {"generationtime_ms": 0.5}
+    if place is not None and (not country or place["country_code"] == country.upper()):
+        payload["results"] = [place]
+    return payload
+
+
+def forecast_payload(
+    latitude: float,
+    longitude: float,
+    query: Dict[str, str],
+    *,
+    days: int,
+    now: datetime,
+    model_run: float,
+) -> Dict[str, Any]:
+    # Smooth, deterministic weather: a daily cycle around a latitude baseline.
+    base = 25 - abs(latitude) * 0.4
+    phase = _seed(round(latitude, 2), round(longitude, 2)) % 24
+
+    def temp(hour: int) -> float:
+        return round(base + 6 * math.sin((hour - phase) / 24 * 2 * math.pi), 1)
+
+    hour_now = now.replace(minute=0, second=0, microsecond=0)
+    current = {"time": hour_now.isoformat(timespec="minutes"), "interval": 900}
+    fields = [f for f in query.get("current", "").split(",") if f]
+    seed = _seed(latitude, longitude, model_run)
+    samples = {
+        "temperature_2m": temp(hour_now.hour),
+        "apparent_temperature": round(temp(hour_now.hour) - 1.5, 1),
+        "weather_code": seed % 4,
+        "relative_humidity_2m": 40 + seed % 50,
+        "wind_speed_10m": round((seed % 300) / 10, 1),
+    }
+    for name in fields:
+        current[name] = samples.get(name, 0)
+    payload: Dict[str, Any] = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "generationtime_ms": 0.05,
+        "utc_offset_seconds": 0,
+        "timezone": "GMT",
+        "timezone_abbreviation": "GMT",
+        "elevation": 38.0,
+        "current_units": {
+            name: CURRENT_UNITS[name]
+            for name in ["time", "interval", *fields]
+            if name in CURRENT_UNITS
+        },
+        "current": current,
+    }
+    hourly = [f for f in query.get("hourly", "").split(",") if f]
+    if hourly:
+        if "forecast_hours" in query:
+            start, count = hour_now, int(query["forecast_hours"])
+        else:
+            start = hour_now.replace(hour=0)
+            count = days * 24
+        stamps = [start + timedelta(hours=i) for i in range(count)]
+        payload["hourly_units"] = {"time": "iso8601", **{f: "°C" for f in hourly}}
+        payload["hourly"] = {
+            "time": [stamp.isoformat(timespec="minutes") for stamp in stamps]
+        }
+        for name in hourly:
+            payload["hourly"][name] = [temp(stamp.hour) for stamp in stamps]
+    return payload
+
+
+class MockOpenMeteo(ThreadingHTTPServer):
+    """Threaded HTTP/1.1 server; one instance per mock configuration."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        days: int = 7,
+        pad: int = 0,
+        update_interval: float = 3600.0,
+        strict: bool = False,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(address, MockHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.days = days
+        self.update_interval = update_interval
+        self.pad = pad
+        self.strict = strict
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """Serve on a daemon thread (for in-process benchmarks)."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def model_run(self) -> float:
+        """Start of the current update interval; the data changes only then."""
+        now = time.time()
+        return now - now % self.update_interval
+
+    def delay_and_fail(self) -> bool:
+        """Count a request, sleep its latency; True if it should fail."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            failed = self.rng.random() < self.error_rate
+            self.errors += failed
+        if delay > 0:
+            time.sleep(delay)
+        return failed
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as the real API does
+    disable_nagle_algorithm = True
+    server: MockOpenMeteo
+
+    def do_GET(self) -> None:
+        parts = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        if self.server.delay_and_fail():
+            self._send(503, {"error": True, "reason": "Mock: injected failure"})
+            return
+        try:
+            if parts.path == "/v1/search":
+                payload: Any = geocode_payload(
+                    query.get("name", ""), query.get("country"), self.server.strict
+                )
+            elif parts.path == "/v1/forecast":
+                model_run = self.server.model_run()
+                payload = self._forecast(query, model_run)
+                self._send(200, payload, last_modified=model_run)
+                return
+            else:
+                self._send(404, {"error": True, "reason": "Not found"})
+                return
+        except (KeyError, ValueError) as exc:
+            self._send(400, {"error": True, "reason": f"Invalid request: {exc}"})
+            return
+        self._send(200, payload)
+
+    def _forecast(self, query: Dict[str, str], model_run: float) -> Any:
+        latitudes = [float(v) for v in query["latitude"].split(",")]
+        longitudes = [float(v) for v in query["longitude"].split(",")]
+        if len(latitudes) != len(longitudes):
+            raise ValueError("latitude and longitude counts differ")
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        payloads: List[Dict[str, Any]] = []
+        for lat, lon in zip(latitudes, longitudes):
+            payload = forecast_payload(
+                lat, lon, query, days=self.server.days, now=now, model_run=model_run
+            )
+            if self.server.pad:
+                payload["padding"] = [0.0] * self.server.pad
+            payloads.append(payload)
+        return payloads if len(payloads) > 1 else payloads[0]
+
+    def _send(
+        self, status: int, payload: Any, *, last_modified: Optional[float] = None
+    ) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        validators = {}
+        if last_modified is not None:
+            digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+            validators["ETag"] = f'"{digest}"'
+            validators["Last-Modified"] = formatdate(last_modified, usegmt=True)
+            if self._not_modified(validators["ETag"], last_modified):
+                self.send_response(304)
+                for name, value in validators.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        for name, value in validators.items():
+            self.send_header(name, value)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag: str, last_modified: float) -> bool:
+        # If-None-Match wins over If-Modified-Since when both are sent.
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+        since = self.headers.get("If-Modified-Since")
+        if since is None:
+            return False
+        try:
+            return parsedate_to_datetime(since).timestamp() >= last_modified
+        except (TypeError, ValueError):
+            return False
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # a load test would drown the terminal
+
+
+def add_server_options(parser: argparse.ArgumentParser) -> None:
+    """Options shared with weather_load.py --spawn."""
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Added delay per request in ms."
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Extra random delay up to N ms."
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with HTTP 503 (0-1).",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        help="Days of hourly data when forecast_hours is not given (default: 7).",
+    )
+    parser.add_argument(
+        "--update-interval",
+        type=float,
+        default=3600.0,
+        help="Seconds between simulated model runs, i.e. how often forecasts "
+        "change and ETag/Last-Modified move on (default: 3600).",
+    )
+    parser.add_argument(
+        "--pad",
+        type=int,
+        default=0,
+        help="Add an unused array of N numbers to each forecast (payload size).",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Only the recorded cities geocode; any other name has no results.",
+    )
+    parser.add_argument("--seed", type=int, help="Seed latency and error sampling.")
+
+
+def make_server(args: argparse.Namespace, host: str, port: int) -> MockOpenMeteo:
+    return MockOpenMeteo(
+        (host, port),
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        days=args.days,
+        pad=args.pad,
+        update_interval=args.update_interval,
+        strict=args.strict,
+        seed=args.seed,
+    )
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind.")
+    add_server_options(parser)
+    args = parser.parse_args(argv)
+    server = make_server(args, args.host, args.port)
+    print(f"Mock Open-Meteo on {server.base_url} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(
+            f"\nServed {server.requests} requests ({server.errors} injected errors).",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -3,23 +3,40 @@
 
 from __future__ import annotations
 
-import argparse
-import json
+# Heavier modules (argparse, json, ssl, urllib) are imported inside the
+# functions that use them, so e.g. --help does not pay for the HTTP stack.
 import math
+import os
 import sys
-import textwrap
-import urllib.error
-import urllib.parse
-import urllib.request
-import ssl
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Collection, Dict
 
-GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
-WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
+if TYPE_CHECKING:
+    import argparse
+    import ssl
+
+    from gazetteer import Gazetteer
+    from weather_cache import ResponseCache
+    from weather_http import ConnectionPool, Response
+
+# weather_batch and weather_watch import this module as `weather`. When it
+# runs as a script, make that name refer to this module, not a second copy
+# with its own URLs and connection pools.
+if __name__ == "__main__":
+    sys.modules.setdefault("weather", sys.modules[__name__])
+
+# Overridable (env or --api-base) to point the client at e.g. mock_open_meteo.py.
+GEOCODE_URL = os.environ.get(
+    "WEATHER_GEOCODE_URL", "https://geocoding-api.open-meteo.com/v1/search"
+)
+WEATHER_URL = os.environ.get(
+    "WEATHER_FORECAST_URL", "https://api.open-meteo.com/v1/forecast"
+)
 USER_AGENT = "PyPracticeWeather/1.0"
 
+# One keep-alive connection pool per SSL context (None: default verification).
+_POOLS: Dict[Any, ConnectionPool] = {}
+
 
 @dataclass(frozen=True)
 class Location:
@@ -31,31 +48,122 @@ class Location:
     longitude: float
 
 
+def _pool(context: ssl.SSLContext | None) -> ConnectionPool:
+    """Return the shared keep-alive pool for this SSL context."""
+    from weather_http import ConnectionPool
+
+    if context not in _POOLS:
+        _POOLS[context] = ConnectionPool(context=context, timeout=10)
+    return _POOLS[context]
+
+
+def _api_get(
+    url: str,
+    params: Dict[str, Any],
+    *,
+    context: ssl.SSLContext | None = None,
+    headers: Dict[str, str] | None = None,
+) -> Response:
+    """GET through the shared connection pool with the client's headers."""
+    request_headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+    request_headers.update(headers or {})
+    return _pool(context).get(url, params, headers=request_headers)
+
+
+def _decode_json(
+    response: Response, fields: Collection[str] | None = None
+) -> Dict[str, Any]:
+    """Decode a 200 response, raising a RuntimeError for anything else.
+
+    With `fields`, only those top-level keys are decoded; the rest is skipped.
+    """
+    import json
+
+    if response.status != 200:
+        raise RuntimeError(f"API call failed with HTTP {response.status}")
+    try:
+        if fields is None:
+            return json.loads(response.body)
+        from weather_json import loads_fields
+
+        return loads_fields(response.body, fields)
+    except ValueError as exc:
+        raise RuntimeError(f"Invalid JSON from API: {exc}") from exc
+
+
 def _request_json(
-    url: str, params: Dict[str, Any], *, context: ssl.SSLContext | None = None
+    url: str,
+    params: Dict[str, Any],
+    *,
+    context: ssl.SSLContext | None = None,
+    fields: Collection[str] | None = None,
 ) -> Dict[str, Any]:
     """Perform a GET request and decode JSON, raising a RuntimeError on issues."""
-    query = urllib.parse.urlencode(params)
-    req = urllib.request.Request(f"{url}?{query}", headers={"User-Agent": USER_AGENT})
-    try:
-        with urllib.request.urlopen(req, timeout=10, context=context) as response:
-            if response.status != 200:
-                raise RuntimeError(f"API call failed with HTTP {response.status}")
-            return json.load(response)
-    except urllib.error.HTTPError as exc:
-        raise RuntimeError(f"API call failed: {exc}") from exc
-    except urllib.error.URLError as exc:
-        raise RuntimeError(f"Network error: {exc}") from exc
+    return _decode_json(_api_get(url, params, context=context), fields)
+
+
+def print_timings() -> None:
+    """Print per-phase timings for every request made so far to stderr."""
+    for pool in _POOLS.values():
+        for url, status, timings in pool.history:
+            print(f"[{status}] {url}\n    {timings}", file=sys.stderr)
+
+
+def _get_json(
+    url: str,
+    params: Dict[str, Any],
+    *,
+    context: ssl.SSLContext | None,
+    cache: ResponseCache | None,
+    expires: Callable[[Dict[str, Any]], float | None],
+    stale_for: float | None = None,
+    fields: Collection[str] | None = None,
+) -> Dict[str, Any]:
+    """Fetch through the response cache when one is given."""
+    if cache is None:
+        return _request_json(url, params, context=context, fields=fields)
+    return cache.fetch(
+        url,
+        params,
+        lambda: _request_json(url, params, context=context, fields=fields),
+        expires=expires,
+        stale_for=stale_for,
+    )
 
 
 def resolve_location(
-    city: str, country: str | None, *, context: ssl.SSLContext | None = None
+    city: str,
+    country: str | None,
+    *,
+    context: ssl.SSLContext | None = None,
+    cache: ResponseCache | None = None,
+    gazetteer: Gazetteer | None = None,
 ) -> Location:
-    """Use the Open-Meteo geocoding API to resolve the city into coordinates."""
+    """Use the Open-Meteo geocoding API to resolve the city into coordinates.
+
+    A city the offline gazetteer knows is resolved without any request.
+    """
+    if gazetteer is not None:
+        place = gazetteer.lookup(city, country)
+        if place is not None:
+            return Location(place.name, place.country, place.latitude, place.longitude)
     params = {"name": city, "count": 1, "language": "en", "format": "json"}
     if country:
         params["country"] = country
-    payload = _request_json(GEOCODE_URL, params, context=context)
+    from weather_cache import geocode_expiry
+
+    # City coordinates do not change, so geocoding results never expire; an
+    # empty result expires soon and is not served stale, so a place the API
+    # learns about later is found again.
+    payload = _get_json(
+        GEOCODE_URL,
+        params,
+        context=context,
+        cache=cache,
+        expires=geocode_expiry,
+        stale_for=0,
+        fields=("results",),
+    )
     results = payload.get("results") or []
     if not results:
         raise RuntimeError(f"No results found for '{city}'")
@@ -68,19 +176,62 @@ def resolve_location(
     )
 
 
-def fetch_weather(
-    location: Location, *, context: ssl.SSLContext | None = None
-) -> Dict[str, Any]:
-    """Fetch the current weather for the provided location coordinates."""
-    params = {
+def forecast_params(location: Location, hours: int | None = None) -> Dict[str, Any]:
+    """Query parameters for one location's forecast (also the cache key).
+
+    `hours` asks for only that many hourly values starting now (0 for none);
+    None keeps the API's full multi-day hourly series.
+    """
+    params: Dict[str, Any] = {
         "latitude": location.latitude,
         "longitude": location.longitude,
         "current": "temperature_2m,apparent_temperature,weather_code,"
         "relative_humidity_2m,wind_speed_10m",
-        "hourly": "temperature_2m",
         "timezone": "auto",
     }
-    return _request_json(WEATHER_URL, params, context=context)
+    if hours is None or hours > 0:
+        params["hourly"] = "temperature_2m"
+    if hours:
+        params["forecast_hours"] = hours
+    return params
+
+
+def forecast_fields(hours: int | None = None) -> tuple[str, ...]:
+    """Top-level response keys that format_report reads."""
+    fields = ("current", "current_units")
+    return fields if hours == 0 else fields + ("hourly", "utc_offset_seconds")
+
+
+def fetch_weather(
+    location: Location,
+    *,
+    context: ssl.SSLContext | None = None,
+    cache: ResponseCache | None = None,
+    hours: int | None = None,
+) -> Dict[str, Any]:
+    """Fetch the current weather, plus `hours` hourly values (None: all)."""
+    params = forecast_params(location, hours)
+    fields = forecast_fields(hours)
+    if cache is None:
+        return _request_json(WEATHER_URL, params, context=context, fields=fields)
+    from weather_cache import forecast_expiry
+
+    return _get_json(
+        WEATHER_URL,
+        params,
+        context=context,
+        cache=cache,
+        expires=lambda payload: forecast_expiry(),
+        fields=fields,
+    )
+
+
+def use_api_base(base: str) -> None:
+    """Send both geocoding and forecast requests to one server, e.g. a mock."""
+    global GEOCODE_URL, WEATHER_URL
+    base = base.rstrip("/")
+    GEOCODE_URL = f"{base}/v1/search"
+    WEATHER_URL = f"{base}/v1/forecast"
 
 
 def c_to_f(temp_c: float) -> float:
@@ -131,11 +282,18 @@ def format_report(
     lines.append(f"Weather code:       {weather_code if weather_code is not None else 'N/A'}")
 
     if hourly_preview > 0:
+        from datetime import datetime
+
         hourly = weather.get("hourly", {})
         timestamps = hourly.get("time", [])
         temps = hourly.get("temperature_2m", [])
+        # A full series starts at midnight; the preview starts this hour.
+        this_hour = current.get("time", "")[:13]
+        upcoming = [
+            (ts, temp) for ts, temp in zip(timestamps, temps) if ts[:13] >= this_hour
+        ]
         preview_lines = ["\nNext hours:"]
-        for ts, temp in list(zip(timestamps, temps))[:hourly_preview]:
+        for ts, temp in upcoming[:hourly_preview]:
             try:
                 timestamp = datetime.fromisoformat(ts)
                 stamp = timestamp.strftime("%a %H:%M")
@@ -150,6 +308,9 @@ def format_report(
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
+    import argparse
+    import textwrap
+
     parser = argparse.ArgumentParser(
         description="Fetch weather from Open-Meteo for a given city.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -157,6 +318,9 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
             """Examples:
             weather.py London
             weather.py --country US \"New York\" --hourly 4 --imperial
+            weather.py --batch London Paris \"Lima, PE\"
+            weather.py --cities-file cities.txt --workers 16 --rate 20
+            weather.py --watch 300 --batch London Paris
             """
         ),
     )
@@ -180,6 +344,61 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         action="store_true",
         help="Display temperatures in Fahrenheit instead of Celsius.",
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Treat each argument as a separate city and fetch them concurrently.",
+    )
+    parser.add_argument(
+        "--cities-file",
+        metavar="PATH",
+        help="Read one city per line ('-' for stdin); implies --batch.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent requests in batch mode (default: 8).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=10.0,
+        help="Maximum API requests per second in batch mode (default: 10).",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="SECONDS",
+        help="Keep polling every SECONDS (longer while nothing changes) and "
+        "print only the lines that changed; Ctrl+C to stop.",
+    )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Append the full hourly forecast to the local archive "
+        "(see forecast_archive.py; needs NumPy).",
+    )
+    parser.add_argument(
+        "--no-gazetteer",
+        action="store_true",
+        help="Always geocode through the API, not the offline city list.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the API instead of the on-disk response cache.",
+    )
+    parser.add_argument(
+        "--api-base",
+        metavar="URL",
+        help="Serve both APIs from this base URL, e.g. http://127.0.0.1:8765.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print DNS/connect/TLS/first-byte/transfer times for each request.",
+    )
     parser.add_argument(
         "--insecure",
         action="store_true",
@@ -188,20 +407,197 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
+def _fetch_hours(args: argparse.Namespace) -> int | None:
+    # Archiving keeps the whole hourly series, not just the previewed hours.
+    return None if args.archive else max(0, args.hourly)
+
+
+def archive_forecast(location: Location, weather: Dict[str, Any]) -> None:
+    """Append the forecast's hourly temperatures to the columnar archive."""
+    try:
+        from forecast_archive import ForecastArchive, hourly_arrays
+    except ImportError as exc:
+        raise RuntimeError(f"--archive needs NumPy ({exc})") from exc
+    times, temps = hourly_arrays(weather)
+    try:
+        ForecastArchive().append(
+            name=f"{location.name}, {location.country}",
+            latitude=location.latitude,
+            longitude=location.longitude,
+            times=times,
+            temps=temps,
+        )
+    except OSError as exc:
+        raise RuntimeError(f"Cannot archive forecast: {exc}") from exc
+
+
+def load_gazetteer() -> Gazetteer | None:
+    """The offline city index, or None if its data file is missing or bad."""
+    from gazetteer import Gazetteer
+
+    try:
+        return Gazetteer.load()
+    except (OSError, ValueError):
+        return None
+
+
+def prompt_city(gazetteer: Gazetteer | None, country: str | None) -> str:
+    """Ask for a city, with Tab completion from the offline gazetteer."""
+    if gazetteer is not None:
+        from gazetteer import install_completer
+
+        install_completer(gazetteer, country)
+    return input("Enter city name: ").strip()
+
+
+def _batch_cities(args: argparse.Namespace) -> list[str]:
+    """Cities from the arguments and --cities-file; empty (reported) on error."""
+    import weather_batch
+
+    cities = list(args.city)
+    if args.cities_file:
+        try:
+            cities.extend(weather_batch.read_cities(args.cities_file))
+        except OSError as exc:
+            print(f"Error: cannot read cities: {exc}", file=sys.stderr)
+            return []
+    if not cities:
+        print("Error: no cities given.", file=sys.stderr)
+    return cities
+
+
+def watch_main(
+    args: argparse.Namespace,
+    cities: list[str],
+    *,
+    context: ssl.SSLContext | None,
+    cache: ResponseCache | None,
+    gazetteer: Gazetteer | None,
+) -> int:
+    """Geocode once, then poll the forecasts until interrupted."""
+    from weather_batch import parse_city
+    from weather_watch import watch_forever
+
+    locations = []
+    for entry in cities:
+        city, country = parse_city(entry, args.country)
+        try:
+            location = resolve_location(
+                city, country, context=context, cache=cache, gazetteer=gazetteer
+            )
+        except RuntimeError as exc:
+            print(f"Error: {entry}: {exc}", file=sys.stderr)
+            continue
+        locations.append(location)
+    if not locations:
+        return 1
+    return watch_forever(
+        locations,
+        interval=max(1.0, args.watch),
+        context=context,
+        imperial=args.imperial,
+        hours=max(0, args.hourly),
+        archive=args.archive,
+    )
+
+
+def batch_main(
+    args: argparse.Namespace,
+    *,
+    context: ssl.SSLContext | None,
+    cache: ResponseCache | None,
+    gazetteer: Gazetteer | None,
+) -> int:
+    """Print a report per city as each one completes; 1 if any city failed."""
+    import weather_batch
+    from weather_http import TokenBucket
+
+    cities = _batch_cities(args)
+    if not cities:
+        return 2
+    _pool(context).limiter = TokenBucket(max(args.rate, 0.1))
+    failed = 0
+    for result in weather_batch.run_batch(
+        cities,
+        country=args.country,
+        context=context,
+        cache=cache,
+        gazetteer=gazetteer,
+        workers=args.workers,
+        hours=_fetch_hours(args),
+    ):
+        if result.error is not None:
+            failed += 1
+            print(f"Error: {result.query}: {result.error}", file=sys.stderr)
+            continue
+        if args.archive:
+            try:
+                archive_forecast(result.location, result.weather)
+            except RuntimeError as exc:
+                print(f"Error: {exc}", file=sys.stderr)
+                return 1
+        report = format_report(
+            result.location,
+            result.weather,
+            imperial=args.imperial,
+            hourly_preview=max(0, args.hourly),
+        )
+        print(report + "\n", flush=True)
+    if failed:
+        print(f"{failed} of {len(cities)} cities failed.", file=sys.stderr)
+    return 1 if failed else 0
+
+
 def main(argv: list[str]) -> int:
     args = parse_args(argv)
+    batch = args.batch or args.cities_file is not None
+    gazetteer = None if args.no_gazetteer else load_gazetteer()
     city = " ".join(args.city).strip()
-    if not city:
-        city = input("Enter city name: ").strip()
-    if not city:
+    if not city and not batch:
+        city = prompt_city(gazetteer, args.country)
+    if not city and not batch:
         print("Error: city name is required.", file=sys.stderr)
         return 2
+    if args.api_base:
+        use_api_base(args.api_base)
     context = None
     if args.insecure:
+        import ssl
+
         context = ssl._create_unverified_context()
+    cache = None
+    if not args.no_cache:
+        from weather_cache import ResponseCache
+
+        cache = ResponseCache()
+    if args.watch is not None:
+        cities = _batch_cities(args) if batch else [city]
+        if not cities:
+            return 2
+        try:
+            return watch_main(
+                args, cities, context=context, cache=cache, gazetteer=gazetteer
+            )
+        finally:
+            if args.timings:
+                print_timings()
+    if batch:
+        try:
+            return batch_main(
+                args, context=context, cache=cache, gazetteer=gazetteer
+            )
+        finally:
+            if args.timings:
+                print_timings()
     try:
-        location = resolve_location(city, args.country, context=context)
-        weather = fetch_weather(location, context=context)
+        location = resolve_location(
+            city, args.country, context=context, cache=cache, gazetteer=gazetteer
+        )
+        weather = fetch_weather(
+            location, context=context, cache=cache, hours=_fetch_hours(args)
+        )
+        if args.archive:
+            archive_forecast(location, weather)
         report = format_report(
             location,
             weather,
@@ -211,6 +607,9 @@ def main(argv: list[str]) -> int:
     except RuntimeError as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
+    finally:
+        if args.timings:
+            print_timings()
 
     print(report)
     return 0
@@ -0,0 +1,171 @@
+"""Resolve and fetch many cities concurrently for `weather.py --batch`."""
+
+from __future__ import annotations
+
+import concurrent.futures as cf
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import weather
+from weather import Location
+
+if TYPE_CHECKING:
+    import ssl
+
+    from gazetteer import Gazetteer
+    from weather_cache import ResponseCache
+
+# Locations per combined forecast request; keeps the URL well under the
+# ~8 KB that servers and proxies commonly accept.
+GROUP_SIZE = 25
+
+
+@dataclass
+class BatchResult:
+    """Outcome for one requested city: a forecast or an error message."""
+
+    query: str
+    location: Optional[Location] = None
+    weather: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def parse_city(entry: str, default_country: str | None) -> Tuple[str, str | None]:
+    """Split "Paris, FR" into ("Paris", "FR"); a bare name uses the default."""
+    name, sep, code = entry.rpartition(",")
+    code = code.strip()
+    if sep and len(code) == 2 and code.isalpha():
+        return name.strip(), code.upper()
+    return entry.strip(), default_country
+
+
+def read_cities(path: str) -> List[str]:
+    """One city per line; blank lines and lines starting with # are skipped."""
+    import sys
+
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, encoding="utf-8") as fh:
+            lines = fh.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+
+def fetch_group(
+    locations: List[Location],
+    *,
+    context: ssl.SSLContext | None,
+    cache: ResponseCache | None,
+    hours: int | None = None,
+) -> List[Dict[str, Any]]:
+    """Fetch forecasts for several locations with one comma-separated request."""
+    params = weather.forecast_params(locations[0], hours)
+    params["latitude"] = ",".join(str(loc.latitude) for loc in locations)
+    params["longitude"] = ",".join(str(loc.longitude) for loc in locations)
+    payload: Any = weather._request_json(
+        weather.WEATHER_URL,
+        params,
+        context=context,
+        fields=weather.forecast_fields(hours),
+    )
+    # The API answers a single location with an object, several with a list.
+    results = payload if isinstance(payload, list) else [payload]
+    if len(results) != len(locations):
+        raise RuntimeError(
+            f"Expected {len(locations)} forecasts, got {len(results)}"
+        )
+    if cache is not None:
+        from weather_cache import forecast_expiry
+
+        expires = forecast_expiry()
+        # Store per location, so a later single-city run hits the cache too.
+        for location, result in zip(locations, results):
+            cache.put(
+                weather.WEATHER_URL,
+                weather.forecast_params(location, hours),
+                result,
+                expires=expires,
+            )
+    return results
+
+
+def run_batch(
+    cities: Iterable[str],
+    *,
+    country: str | None,
+    context: ssl.SSLContext | None,
+    cache: ResponseCache | None,
+    gazetteer: Gazetteer | None = None,
+    workers: int = 8,
+    group_size: int = GROUP_SIZE,
+    hours: int | None = None,
+) -> Iterator[BatchResult]:
+    """Yield a result per city as soon as its forecast (or error) is ready.
+
+    Geocoding runs one request per city on the thread pool. Resolved
+    locations without a fresh cached forecast are collected into groups, and
+    each group becomes one combined forecast request on the same pool.
+    """
+    group: List[Tuple[str, Location]] = []
+    geocoding: Dict[cf.Future, str] = {}
+    forecasting: Dict[cf.Future, List[Tuple[str, Location]]] = {}
+
+    with cf.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+
+        def flush() -> None:
+            locations = [location for _, location in group]
+            future = executor.submit(
+                fetch_group, locations, context=context, cache=cache, hours=hours
+            )
+            forecasting[future] = list(group)
+            group.clear()
+
+        for entry in cities:
+            city, city_country = parse_city(entry, country)
+            future = executor.submit(
+                weather.resolve_location,
+                city,
+                city_country,
+                context=context,
+                cache=cache,
+                gazetteer=gazetteer,
+            )
+            geocoding[future] = entry
+
+        while geocoding or forecasting:
+            done, _ = cf.wait(
+                [*geocoding, *forecasting], return_when=cf.FIRST_COMPLETED
+            )
+            for future in done:
+                if future in geocoding:
+                    query = geocoding.pop(future)
+                    try:
+                        location = future.result()
+                    except RuntimeError as exc:
+                        yield BatchResult(query, error=str(exc))
+                        continue
+                    cached = None
+                    if cache is not None:
+                        cached = cache.get(
+                            weather.WEATHER_URL,
+                            weather.forecast_params(location, hours),
+                        )
+                    if cached is not None and cached[1]:
+                        yield BatchResult(query, location, cached[0])
+                        continue
+                    group.append((query, location))
+                    if len(group) >= group_size:
+                        flush()
+                else:
+                    members = forecasting.pop(future)
+                    try:
+                        results = future.result()
+                    except RuntimeError as exc:
+                        for query, location in members:
+                            yield BatchResult(query, location, error=str(exc))
+                        continue
+                    for (query, location), result in zip(members, results):
+                        yield BatchResult(query, location, result)
+            # Once no geocode is outstanding, a partial group will not grow.
+            if group and not geocoding:
+                flush()
@@ -0,0 +1,199 @@
+"""Persistent on-disk cache for Open-Meteo API responses used by weather.py."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CACHE_DIR = Path(
+    os.environ.get("WEATHER_CACHE_DIR")
+    or Path.home() / ".cache" / "pypractice-weather"
+)
+# Open-Meteo refreshes its forecast models at most hourly, so a forecast
+# stays fresh until the next full hour (UTC) rather than for a fixed TTL.
+FORECAST_INTERVAL = 3600
+# After expiry a forecast is still served, and refreshed in the background,
+# for this long (stale-while-revalidate). One interval keeps a report shown
+# as current at most two hours old and at most one model update behind.
+STALE_WINDOW = FORECAST_INTERVAL
+# A geocoding search with no results (a typo, or a place the API does not
+# know yet) is cached this long, and never served once it expires.
+NEGATIVE_TTL = 600
+# Oldest-used entries are evicted once the cache grows past this size, down
+# to EVICT_TO of it, so the next eviction scan is many puts away.
+MAX_BYTES = 8 * 1024 * 1024
+EVICT_TO = 0.75
+
+
+def forecast_expiry(now: float | None = None) -> float:
+    """Return the start of the next model update interval after `now`."""
+    now = time.time() if now is None else now
+    return (now // FORECAST_INTERVAL + 1) * FORECAST_INTERVAL
+
+
+def geocode_expiry(payload: Dict[str, Any]) -> float | None:
+    """Coordinates never change; an empty search expires after NEGATIVE_TTL."""
+    return None if payload.get("results") else time.time() + NEGATIVE_TTL
+
+
+class ResponseCache:
+    """JSON payloads keyed by URL and query, one small file per entry."""
+
+    def __init__(self, directory: Path = CACHE_DIR, *, max_bytes: int = MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Running total of the directory's size, from one scan on the first
+        # put plus what each put adds, so a put only scans again when the
+        # total says eviction is due.
+        self._size: int | None = None
+        self._size_lock = threading.Lock()
+
+    def _path(self, url: str, params: Dict[str, Any]) -> Path:
+        query = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+        return self.directory / f"{digest[:32]}.json"
+
+    def get(
+        self, url: str, params: Dict[str, Any]
+    ) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Return (payload, is_fresh), or None if missing or too stale to use."""
+        path = self._path(url, params)
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        expires = entry.get("expires")
+        stale_for = entry.get("stale_for", STALE_WINDOW)
+        now = time.time()
+        if expires is not None and now >= expires + stale_for:
+            return None
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return entry["payload"], expires is None or now < expires
+
+    def put(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        payload: Dict[str, Any],
+        *,
+        expires: float | None,
+        stale_for: float | None = None,
+    ) -> None:
+        """Store a payload; `expires=None` keeps it until evicted.
+
+        After `expires` the payload is still served, as stale, for `stale_for`
+        seconds (default STALE_WINDOW).
+        """
+        path = self._path(url, params)
+        entry = {
+            "url": url,
+            "expires": expires,
+            "stale_for": STALE_WINDOW if stale_for is None else stale_for,
+            "payload": payload,
+        }
+        text = json.dumps(entry)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                replaced = 0
+            tmp = path.with_name(
+                f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+            self._grew(len(text) - replaced)
+        except OSError:
+            # A cache that cannot be written is just a slower cache.
+            pass
+
+    def fetch(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        load: Callable[[], Dict[str, Any]],
+        *,
+        expires: Callable[[Dict[str, Any]], float | None],
+        stale_for: float | None = None,
+    ) -> Dict[str, Any]:
+        """Return a cached payload, calling `load` only when there is none.
+
+        `expires` gets the loaded payload and returns its expiry time. A stale
+        payload is returned immediately while `load` runs on a background
+        thread to refresh the entry for next time.
+        """
+        hit = self.get(url, params)
+        if hit is not None:
+            payload, fresh = hit
+            if not fresh:
+                self._refresh_later(url, params, load, expires, stale_for)
+            return payload
+        payload = load()
+        self.put(url, params, payload, expires=expires(payload), stale_for=stale_for)
+        return payload
+
+    def _refresh_later(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        load: Callable[[], Dict[str, Any]],
+        expires: Callable[[Dict[str, Any]], float | None],
+        stale_for: float | None,
+    ) -> None:
+        def refresh() -> None:
+            try:
+                payload = load()
+                self.put(
+                    url, params, payload, expires=expires(payload), stale_for=stale_for
+                )
+            except RuntimeError:
+                pass  # keep serving the stale copy
+
+        # Not a daemon thread: the process finishes the refresh before exiting,
+        # after the report has already been printed.
+        threading.Thread(target=refresh).start()
+
+    def _grew(self, delta: int) -> None:
+        with self._size_lock:
+            if self._size is not None:
+                self._size += delta
+                if self._size <= self.max_bytes:
+                    return
+            self._size = self._evict()
+
+    def _evict(self) -> int:
+        """Past max_bytes, drop least recently used entries down to EVICT_TO of it.
+
+        Returns the total size left in the directory.
+        """
+        target = int(self.max_bytes * EVICT_TO)
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return total
+        for _, size, path in sorted(entries):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            if total <= target:
+                break
+        return total
@@ -0,0 +1,327 @@
+"""Keep-alive HTTP(S) connection pool with per-phase request timings.
+
+`urllib.request.urlopen` opens a new connection, with a full TLS handshake,
+for every call. This pool keeps one idle connection per host (up to a small
+limit), reuses the caller's `ssl.SSLContext`, asks for gzip bodies, retries
+transient failures with exponential backoff, and records how long DNS,
+connect, TLS, time to first byte and transfer took for every request. Like
+urlopen, it goes through the proxy named by HTTP_PROXY/HTTPS_PROXY unless
+NO_PROXY exempts the host, tunnelling HTTPS with CONNECT.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import http.client
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Statuses worth retrying: rate limiting and transient server errors.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TransportError(RuntimeError):
+    """The request could not be completed, even after retries."""
+
+
+@dataclass
+class _Proxy:
+    """Proxy server to connect to instead of the target host."""
+
+    host: str
+    port: int
+    headers: Dict[str, str]
+
+
+class TokenBucket:
+    """Blocking rate limiter: `rate` requests per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class Timings:
+    """Seconds spent in each phase of one request (0 for a reused socket)."""
+
+    dns: float = 0.0
+    connect: float = 0.0
+    tls: float = 0.0
+    ttfb: float = 0.0
+    transfer: float = 0.0
+    reused: bool = False
+    attempts: int = 1
+
+    @property
+    def total(self) -> float:
+        return self.dns + self.connect + self.tls + self.ttfb + self.transfer
+
+    def __str__(self) -> str:
+        phases = " ".join(
+            f"{name}={getattr(self, name) * 1000:.1f}ms"
+            for name in ("dns", "connect", "tls", "ttfb", "transfer")
+        )
+        extra = " (reused connection)" if self.reused else ""
+        if self.attempts > 1:
+            extra += f" ({self.attempts} attempts)"
+        return f"{phases} total={self.total * 1000:.1f}ms{extra}"
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    timings: Timings = field(default_factory=Timings)
+
+
+class _TimedConnection(http.client.HTTPConnection):
+    """HTTP connection that does its own DNS/connect/TLS so each is timed."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        timeout: float,
+        ssl_context: Optional[ssl.SSLContext],
+    ) -> None:
+        super().__init__(host, port, timeout=timeout)
+        self.ssl_context = ssl_context
+        self.timings = Timings()
+
+    def connect(self) -> None:
+        # With set_tunnel(), host/port are the proxy's and the tunnel host is
+        # the server that TLS must verify.
+        timings = self.timings
+        start = time.perf_counter()
+        infos = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        timings.dns = resolved - start
+        sock = None
+        error: Optional[OSError] = None
+        for family, kind, proto, _, address in infos:
+            sock = socket.socket(family, kind, proto)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(address)
+                break
+            except OSError as exc:
+                sock.close()
+                sock, error = None, exc
+        if sock is None:
+            raise error or OSError(f"could not connect to {self.host}")
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        server = self.host
+        if self._tunnel_host:
+            self.sock = sock
+            self._tunnel()
+            server = self._tunnel_host
+        connected = time.perf_counter()
+        timings.connect = connected - resolved
+        if self.ssl_context is not None:
+            sock = self.ssl_context.wrap_socket(sock, server_hostname=server)
+            timings.tls = time.perf_counter() - connected
+        self.sock = sock
+
+
+class ConnectionPool:
+    """Idle keep-alive connections keyed by (scheme, host, port); thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        context: Optional[ssl.SSLContext] = None,
+        timeout: float = 10.0,
+        max_idle_per_host: int = 4,
+        retries: int = 2,
+        backoff: float = 0.25,
+        limiter: Optional[TokenBucket] = None,
+    ) -> None:
+        self.context = context
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.retries = retries
+        self.backoff = backoff
+        # Every attempt that goes to the network, retries included, waits here.
+        self.limiter = limiter
+        # Bounded, so a long-running --watch does not grow without limit.
+        self.history: Deque[Tuple[str, int, Timings]] = deque(maxlen=1000)
+        self._idle: Dict[Tuple[str, str, int], List[_TimedConnection]] = {}
+        self._lock = threading.Lock()
+        # Read from the environment once, like the SSL context.
+        self._proxies = urllib.request.getproxies()
+        self._routes: Dict[Tuple[str, str, int], Optional[_Proxy]] = {}
+
+    def _ssl_context(self) -> ssl.SSLContext:
+        if self.context is None:
+            # Loading the CA store is slow, so do it once per pool.
+            self.context = ssl.create_default_context()
+        return self.context
+
+    def _proxy(self, key: Tuple[str, str, int]) -> Optional[_Proxy]:
+        """The proxy for requests to key, or None to connect directly."""
+        if key in self._routes:
+            return self._routes[key]
+        scheme, host, _ = key
+        url = self._proxies.get(scheme)
+        proxy = None
+        if url and not urllib.request.proxy_bypass(host):
+            parts = urllib.parse.urlsplit(url if "://" in url else f"http://{url}")
+            headers = {}
+            if parts.username:
+                user = urllib.parse.unquote(parts.username)
+                password = urllib.parse.unquote(parts.password or "")
+                token = base64.b64encode(f"{user}:{password}".encode()).decode("ascii")
+                headers["Proxy-Authorization"] = f"Basic {token}"
+            proxy = _Proxy(parts.hostname or "", parts.port or 80, headers)
+        self._routes[key] = proxy
+        return proxy
+
+    def _checkout(self, key: Tuple[str, str, int]) -> _TimedConnection:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                conn.timings = Timings(reused=True)
+                return conn
+        scheme, host, port = key
+        context = self._ssl_context() if scheme == "https" else None
+        proxy = self._proxy(key)
+        if proxy is None:
+            return _TimedConnection(
+                host, port, timeout=self.timeout, ssl_context=context
+            )
+        conn = _TimedConnection(
+            proxy.host, proxy.port, timeout=self.timeout, ssl_context=context
+        )
+        if scheme == "https":
+            conn.set_tunnel(host, port, headers=proxy.headers)
+        return conn
+
+    def _checkin(self, key: Tuple[str, str, int], conn: _TimedConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        """GET url?params, retrying connection failures and retryable statuses."""
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        target = parts.path or "/"
+        query = urllib.parse.urlencode(params or {})
+        if parts.query or query:
+            target += "?" + "&".join(q for q in (parts.query, query) if q)
+        request_headers = {"Accept-Encoding": "gzip", "Connection": "keep-alive"}
+        proxy = self._proxy(key)
+        if proxy is not None and scheme == "http":
+            # A plain HTTP proxy takes the absolute URL and its own credentials.
+            target = f"http://{parts.netloc.rpartition('@')[2]}{target}"
+            request_headers.update(proxy.headers)
+        request_headers.update(headers or {})
+
+        attempt = 0
+        while True:
+            attempt += 1
+            conn = self._checkout(key)
+            reused = conn.timings.reused
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                response = self._send(conn, target, request_headers)
+            except (OSError, http.client.HTTPException, TransportError) as exc:
+                conn.close()
+                # A kept-alive socket the server already closed fails on
+                # reuse; that is not a real failure, so retry at once.
+                if reused:
+                    attempt -= 1
+                    continue
+                if attempt > self.retries:
+                    raise TransportError(f"Network error: {exc}") from exc
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+                continue
+            response.timings.attempts = attempt
+            if response.headers.get("connection", "").lower() == "close":
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            if response.status in RETRY_STATUSES and attempt <= self.retries:
+                delay = self.backoff * 2 ** (attempt - 1)
+                retry_after = response.headers.get("retry-after", "")
+                if retry_after.isdigit():
+                    delay = max(delay, min(float(retry_after), 30.0))
+                time.sleep(delay)
+                continue
+            with self._lock:
+                self.history.append((url, response.status, response.timings))
+            return response
+
+    def _send(
+        self, conn: _TimedConnection, target: str, headers: Dict[str, str]
+    ) -> Response:
+        timings = conn.timings
+        if conn.sock is None:
+            conn.connect()
+        start = time.perf_counter()
+        conn.request("GET", target, headers=headers)
+        raw = conn.getresponse()
+        first_byte = time.perf_counter()
+        body = raw.read()
+        done = time.perf_counter()
+        timings.ttfb = first_byte - start
+        timings.transfer = done - first_byte
+        response_headers = {name.lower(): value for name, value in raw.getheaders()}
+        if response_headers.get("content-encoding", "").lower() == "gzip":
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError, zlib.error) as exc:
+                # A truncated or corrupt body; retried like a dropped connection.
+                raise TransportError(f"bad gzip body ({exc})") from exc
+        if raw.will_close:
+            response_headers.setdefault("connection", "close")
+        return Response(raw.status, response_headers, body, timings)
@@ -0,0 +1,120 @@
+"""Decode only the wanted top-level keys of a JSON object.
+
+Unwanted values are skipped instead of being built into Python objects. The
+skipping leans on C-speed str.find/str.count: a flat array such as an
+Open-Meteo hourly series is passed over in one jump to its closing bracket,
+so only the fields a caller asked for cost a real parse.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Collection, Dict
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_SCALAR = re.compile(r"[^,}\]\s]+")
+_KEY = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*')
+_SEPARATOR = re.compile(r"\s*([,}])\s*")
+
+
+def _skip_string(text: str, pos: int) -> int:
+    """Return the index just past the string whose opening quote is at `pos`."""
+    end = text.index('"', pos + 1)
+    while text[end - 1] == "\\":
+        # The quote is escaped only if preceded by an odd run of backslashes.
+        run = end - 1
+        while text[run - 1] == "\\":
+            run -= 1
+        if (end - run) % 2 == 0:
+            break
+        end = text.index('"', end + 1)
+    return end + 1
+
+
+def _skip_flat_array(text: str, pos: int) -> int:
+    """Index past a nesting-free array at `pos`, or -1 if it is not one."""
+    end = text.find("]", pos)
+    body = text[pos + 1 : end]
+    if end < 0 or "[" in body or "{" in body or "\\" in body:
+        return -1
+    # An odd quote count means the "]" found sits inside a string.
+    return end + 1 if body.count('"') % 2 == 0 else -1
+
+
+def _skip_value(text: str, pos: int) -> int:
+    """Return the index just past the JSON value starting at `pos`."""
+    first = text[pos]
+    if first == '"':
+        return _skip_string(text, pos)
+    if first not in "[{":
+        return _SCALAR.match(text, pos).end()
+    depth = 0
+    while True:
+        char = text[pos]
+        if char == "[":
+            end = _skip_flat_array(text, pos)
+            if end > 0:
+                pos = end
+                if depth == 0:
+                    return pos
+            else:
+                depth += 1
+                pos += 1
+        elif char == "{":
+            depth += 1
+            pos += 1
+        elif char == '"':
+            pos = _skip_string(text, pos)
+        else:  # closing bracket
+            depth -= 1
+            pos += 1
+            if depth == 0:
+                return pos
+        pos = _STRUCTURAL.search(text, pos).start()
+
+
+def loads_fields(text: str | bytes, fields: Collection[str]) -> Any:
+    """Like json.loads, but keep only `fields` of a top-level object.
+
+    Decoding stops as soon as every wanted field has been seen, so the rest
+    of the document is neither parsed nor validated. Anything other than an
+    object (e.g. a list of forecasts) is decoded in full. Raises ValueError
+    on malformed input.
+    """
+    if isinstance(text, bytes):
+        text = text.decode("utf-8")
+    start = _WHITESPACE.match(text).end()
+    if not text.startswith("{", start):
+        return json.loads(text)
+    wanted = set(fields)
+    result: Dict[str, Any] = {}
+    pos = _WHITESPACE.match(text, start + 1).end()
+    if text.startswith("}", pos):
+        return result
+    try:
+        while wanted:
+            key_match = _KEY.match(text, pos)
+            if key_match is None:
+                raise ValueError(f"expected a key at {pos}")
+            key = key_match.group(1)
+            if "\\" in key:
+                key = json.loads(f'"{key}"')
+            pos = key_match.end()
+            if key in wanted:
+                wanted.discard(key)
+                result[key], pos = _DECODER.raw_decode(text, pos)
+            else:
+                pos = _skip_value(text, pos)
+            separator = _SEPARATOR.match(text, pos)
+            if separator is None:
+                raise ValueError(f"expected ',' or '}}' at {pos}")
+            if separator.group(1) == "}":
+                break
+            pos = separator.end()
+    except (AttributeError, IndexError) as exc:
+        # A search that found nothing, or input that ended too soon.
+        raise ValueError(f"malformed JSON near {pos}") from exc
+    return result
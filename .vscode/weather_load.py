@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Load driver for the weather client: throughput and latency percentiles.
+
+Runs resolve_location, fetch_weather or the whole main() path from several
+threads against an API base URL, normally mock_open_meteo.py:
+
+    python weather_load.py --spawn --latency 30 --concurrency 16 --requests 2000
+    python weather_load.py --api-base http://127.0.0.1:8765 --mode main
+
+--spawn runs the mock in this process, which is convenient but shares the
+GIL with the client; start it separately for more faithful numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import itertools
+import statistics
+import sys
+import threading
+import time
+from typing import Callable, List
+
+import mock_open_meteo
+import weather
+
+CITIES = ("London", "Paris", "Berlin", "New York", "Tokyo")
+
+
+def make_call(mode: str, hourly: int) -> Callable[[str], None]:
+    """Return the client operation to time for one city."""
+    location = weather.Location("Mock", "Mockland", 51.5, -0.1)
+    if mode == "geocode":
+        return lambda city: weather.resolve_location(city, None)
+    if mode == "forecast":
+        return lambda city: weather.fetch_weather(location, hours=hourly)
+    # Skip the offline gazetteer so every call still geocodes over HTTP (and
+    # does not reload cities.csv), as the other modes do.
+    argv = ["--no-cache", "--no-gazetteer", "--hourly", str(hourly)]
+
+    def run_main(city: str) -> None:
+        # stdout is swapped for the whole run in drive(), not per call:
+        # redirect_stdout is process-wide and would race between threads.
+        if weather.main([*argv, city]) != 0:
+            raise RuntimeError("main() failed")
+
+    return run_main
+
+
+def drive(
+    call: Callable[[str], None], *, requests: int, concurrency: int
+) -> tuple[List[float], int, float]:
+    """Run `requests` calls on `concurrency` threads.
+
+    Returns the latencies of successful calls (seconds), the error count and
+    the wall time.
+    """
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker() -> None:
+        nonlocal errors
+        while (index := next(counter)) < requests:
+            start = time.perf_counter()
+            try:
+                call(CITIES[index % len(CITIES)])
+            except RuntimeError:
+                with lock:
+                    errors += 1
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, concurrency))]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def format_results(
+    latencies: List[float], errors: int, wall: float, requests: int
+) -> str:
+    lines = [
+        f"Requests:    {requests} ({errors} failed after retries)",
+        f"Wall time:   {wall:.2f}s",
+        f"Throughput:  {len(latencies) / wall:.1f} calls/s",
+    ]
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        ms = {p: cuts[p - 1] * 1000 for p in (50, 90, 99)}
+        lines.append(
+            f"Latency:     p50 {ms[50]:.1f}ms  p90 {ms[90]:.1f}ms  "
+            f"p99 {ms[99]:.1f}ms  max {max(latencies) * 1000:.1f}ms"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--api-base", metavar="URL", help="Server to load.")
+    target.add_argument(
+        "--spawn", action="store_true", help="Start a mock server in this process."
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("geocode", "forecast", "main"),
+        default="forecast",
+        help="Client path to exercise (default: forecast).",
+    )
+    parser.add_argument("--requests", type=int, default=500, help="Total calls.")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Client threads (default: 8)."
+    )
+    parser.add_argument(
+        "--hourly", type=int, default=0, help="Hourly values to request per forecast."
+    )
+    mock_open_meteo.add_server_options(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    server = None
+    base = args.api_base
+    if args.spawn:
+        server = mock_open_meteo.make_server(args, "127.0.0.1", 0)
+        server.start()
+        base = server.base_url
+    weather.use_api_base(base)
+    # Keep one idle connection per client thread instead of reconnecting.
+    weather._pool(None).max_idle_per_host = max(1, args.concurrency)
+    call = make_call(args.mode, max(0, args.hourly))
+    print(
+        f"{args.mode}: {args.requests} calls, {args.concurrency} threads -> {base}",
+        file=sys.stderr,
+    )
+    try:
+        latencies, errors, wall = drive(
+            call, requests=args.requests, concurrency=args.concurrency
+        )
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    print(format_results(latencies, errors, wall, args.requests))
+    if server is not None:
+        print(f"Server:      {server.requests} requests, {server.errors} injected errors")
+    return 1 if errors == args.requests else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,119 @@
+"""Poll forecasts with conditional requests for `weather.py --watch`."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import weather
+from weather import Location
+
+if TYPE_CHECKING:
+    import ssl
+
+# An unchanged poll stretches the interval by this factor, up to MAX_BACKOFF
+# times the requested one; a change snaps it back.
+BACKOFF = 1.5
+MAX_BACKOFF = 8
+
+
+@dataclass
+class Watch:
+    """Polling state for one location."""
+
+    location: Location
+    params: Dict[str, Any]
+    interval: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Fallback for servers without validators: hash of the last body.
+    digest: Optional[str] = None
+    lines: List[str] = field(default_factory=list)
+
+
+def poll(
+    watch: Watch, *, context: ssl.SSLContext | None, hours: int | None
+) -> Optional[Dict[str, Any]]:
+    """Return the new forecast, or None if it has not changed since last time."""
+    headers = {}
+    if watch.etag:
+        headers["If-None-Match"] = watch.etag
+    if watch.last_modified:
+        headers["If-Modified-Since"] = watch.last_modified
+    response = weather._api_get(
+        weather.WEATHER_URL, watch.params, context=context, headers=headers
+    )
+    if response.status == 304:
+        return None
+    payload = weather._decode_json(response, weather.forecast_fields(hours))
+    watch.etag = response.headers.get("etag")
+    watch.last_modified = response.headers.get("last-modified")
+    digest = hashlib.blake2b(response.body, digest_size=16).hexdigest()
+    if digest == watch.digest:
+        return None
+    watch.digest = digest
+    return payload
+
+
+def changed_lines(old: List[str], new: List[str]) -> List[str]:
+    """Lines of `new` that differ from the same line of `old`."""
+    return [line for i, line in enumerate(new) if i >= len(old) or old[i] != line]
+
+
+def watch_forever(
+    locations: List[Location],
+    *,
+    interval: float,
+    context: ssl.SSLContext | None,
+    imperial: bool,
+    hours: int,
+    archive: bool = False,
+) -> int:
+    """Poll every location until interrupted, printing only what changed.
+
+    With `archive`, the full hourly series is fetched and every new one is
+    appended to the forecast archive.
+    """
+    fetch_hours = None if archive else hours
+    watches = [
+        Watch(location, weather.forecast_params(location, fetch_hours), interval)
+        for location in locations
+    ]
+    # (due time, index) so the soonest poll always comes first.
+    schedule = [(time.monotonic(), i) for i in range(len(watches))]
+    heapq.heapify(schedule)
+    try:
+        while True:
+            due, index = heapq.heappop(schedule)
+            time.sleep(max(0.0, due - time.monotonic()))
+            watch = watches[index]
+            stamp = datetime.now().strftime("%H:%M:%S")
+            try:
+                payload = poll(watch, context=context, hours=fetch_hours)
+                if payload is not None and archive:
+                    weather.archive_forecast(watch.location, payload)
+            except RuntimeError as exc:
+                print(f"[{stamp}] {watch.location.name}: {exc}", flush=True)
+                payload = None
+            changed: List[str] = []
+            if payload is not None:
+                lines = weather.format_report(
+                    watch.location, payload, imperial=imperial, hourly_preview=hours
+                ).splitlines()
+                changed = changed_lines(watch.lines, lines)
+                if changed:
+                    header = lines[0]
+                    body = [line for line in changed if line != header]
+                    print(f"[{stamp}] {header}", *body, sep="\n", flush=True)
+                watch.lines = lines
+            if changed:
+                watch.interval = interval
+            else:
+                watch.interval = min(watch.interval * BACKOFF, interval * MAX_BACKOFF)
+            heapq.heappush(schedule, (time.monotonic() + watch.interval, index))
+    except KeyboardInterrupt:
+        return 0
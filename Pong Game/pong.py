@@ -1,5 +1,33 @@
+import argparse
+import time
 import turtle
 
+import pong_core
+
+FPS = 60
+FRAME_MS = 1000 // FPS
+# How often the network stats line is redrawn.
+STATS_EVERY = 0.5
+
+parser = argparse.ArgumentParser(description="Two-player Pong.")
+mode = parser.add_mutually_exclusive_group()
+mode.add_argument(
+    "--host",
+    type=int,
+    nargs="?",
+    const=50505,
+    metavar="PORT",
+    help="Host a network game on PORT; you play the left paddle.",
+)
+mode.add_argument(
+    "--join",
+    metavar="HOST[:PORT]",
+    help="Join a hosted game; you play the right paddle.",
+)
+parser.add_argument("--loss", type=float, default=0.0, help="Simulated packet loss.")
+parser.add_argument("--delay", type=float, default=0.0, help="Simulated delay (s).")
+args = parser.parse_args()
+
 wn = turtle.Screen()
 wn.title("Png by @CodeWithBhim")
 wn.bgcolor("black")
@@ -31,67 +59,101 @@ ball.shape("circle")
 ball.color("white")
 ball.penup()
 ball.goto(0,0)
-ball.dx = 2
-ball.dy = -2
+
+# Game state lives in pong_core; the turtles above only draw it.
+state = pong_core.PongState()
+clock = pong_core.FixedTimestep()
+server = client = None
+if args.host is not None or args.join:
+    import pong_net
+
+    link = {"loss": args.loss, "delay": args.delay}
+    if args.host is not None:
+        server = pong_net.NetServer(state, port=args.host, **link)
+        wn.title(f"Pong - hosting on port {args.host}")
+    else:
+        client = pong_net.NetClient(pong_net.parse_address(args.join), **link)
+        wn.title(f"Pong - joined {args.join}")
+
+# Network stats readout
+stats_pen = turtle.Turtle()
+stats_pen.hideturtle()
+stats_pen.penup()
+stats_pen.color("gray")
+stats_pen.goto(0, 270)
+last_stats = 0.0
 
 # Function
 def paddle_a_up():
-    y = paddle_a.ycor()
-    y +=20
-    paddle_a.sety(y)
+    state.paddle_a.up()
 
 def paddle_a_down():
-    y = paddle_a.ycor()
-    y -=20
-    paddle_a.sety(y)
+    state.paddle_a.down()
 
 def paddle_b_up():
-    y = paddle_b.ycor()
-    y +=20
-    paddle_b.sety(y)
+    if client:
+        client.press(1)
+    else:
+        state.paddle_b.up()
 
 def paddle_b_down():
-    y = paddle_b.ycor()
-    y -=20
-    paddle_b.sety(y)
-
-# Keyboard Binding
-wn.listen()
-wn.onkeypress(paddle_a_up, "w")
-wn.onkeypress(paddle_a_down, "s")
-wn.onkeypress(paddle_b_up, "Up")
-wn.onkeypress(paddle_b_down, "Down")
-
-# Main game loop
-while True:
+    if client:
+        client.press(-1)
+    else:
+        state.paddle_b.down()
+
+def draw():
+    global last_stats
+    if client:
+        view = client.view()
+        if view is not None:
+            ball_x, ball_y, paddle_a_y, paddle_b_y = view
+            paddle_a.sety(paddle_a_y)
+            paddle_b.sety(paddle_b_y)
+            ball.goto(ball_x, ball_y)
+    else:
+        paddle_a.sety(state.paddle_a.y)
+        paddle_b.sety(state.paddle_b.y)
+        ball.goto(state.ball.x, state.ball.y)
+    net = server or client
+    now = time.monotonic()
+    if net and now - last_stats >= STATS_EVERY:
+        last_stats = now
+        stats_pen.clear()
+        waiting = server.peer is None if server else not client.connected
+        text = "Waiting for the other player..." if waiting else net.stats.summary()
+        stats_pen.write(text, align="center", font=("Courier", 12, "normal"))
     wn.update()
 
-    # Move the ball
-    ball.setx(ball.xcor() + ball.dx)
-    ball.sety(ball.ycor() + ball.dy)
-
-    # Border checking
-    if ball.ycor() > 290:
-        ball.sety(290)
-        ball.dy *= -1
-
-    if ball.ycor() < -290:
-        ball.sety(-290)
-        ball.dy *= -1
-
-    if ball.xcor() > 390:
-        ball.goto(0, 0)
-        ball.dx *= -1
-
-    if ball.xcor() < -390:
-        ball.goto(0, 0)
-        ball.dx *= -1
-
-    # Paddle and ball collisions
-    if (ball.xcor() > 340) and (ball.ycor() < paddle_b.ycor() + 50 and ball.ycor() > paddle_b.ycor() - 50):
-        ball.setx(340)
-        ball.dx *= -1
-
-    if (ball.xcor() < -340) and (ball.ycor() < paddle_a.ycor() + 50 and ball.ycor() > paddle_a.ycor() - 50):
-        ball.setx(-340)
-        ball.dx *= -1
\ No newline at end of file
+# Keyboard Binding: locally both players share the keyboard; over the
+# network each side drives its own paddle with either key set.
+wn.listen()
+left_up, left_down = paddle_a_up, paddle_a_down
+right_up, right_down = paddle_b_up, paddle_b_down
+if server:
+    right_up, right_down = paddle_a_up, paddle_a_down
+elif client:
+    left_up, left_down = paddle_b_up, paddle_b_down
+wn.onkeypress(left_up, "w")
+wn.onkeypress(left_down, "s")
+wn.onkeypress(right_up, "Up")
+wn.onkeypress(right_down, "Down")
+
+# Main game loop: run whole physics ticks for the time that has passed,
+# draw once, then sleep in Tk until the next frame is due. A joining client
+# has no physics of its own; it draws what the host sends.
+def frame():
+    if client:
+        client.poll()
+    else:
+        if server:
+            server.poll()
+        for _ in range(clock.advance(time.perf_counter())):
+            state.step(pong_core.FIXED_DT)
+            if server:
+                server.broadcast()
+    draw()
+    wn.ontimer(frame, FRAME_MS)
+
+frame()
+wn.mainloop()
@@ -0,0 +1,173 @@
+"""Pure-Python game state and physics for the turtle Pong front end.
+
+Nothing in here touches turtle, so the same rules can be stepped headless,
+at any tick rate, and independently of how fast the screen redraws.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+# Court geometry (same numbers the turtle version used).
+COURT_TOP = 290
+COURT_BOTTOM = -290
+GOAL_X = 390
+PADDLE_X = 350
+PADDLE_FACE_X = 340
+PADDLE_HALF_HEIGHT = 50
+PADDLE_STEP = 20
+
+# Physics runs at a fixed rate no matter how fast frames are drawn. Swept
+# collisions keep this accurate even at low rates, so one tick per frame is
+# plenty.
+TICK_RATE = 60
+FIXED_DT = 1 / TICK_RATE
+# Units per second; the original loop moved the ball 2px per iteration.
+BALL_SPEED = 240
+# Safety valve on bounces handled inside a single step. Steps keep resolving
+# impacts until dt is used up; only a runaway step ever reaches this, and then
+# the ball is clamped into the court instead of flying on unchecked.
+MAX_IMPACTS_PER_STEP = 10_000
+# Tie-break for impacts that happen at the same instant.
+IMPACT_ORDER = {"top": 0, "bottom": 0, "paddle_a": 1, "paddle_b": 1, "goal": 2}
+# Never simulate more than this many ticks in one frame (e.g. after a stall).
+MAX_TICKS_PER_FRAME = 10
+
+
+@dataclass
+class Paddle:
+    """Vertical position of one paddle; x never changes."""
+
+    x: float
+    y: float = 0.0
+
+    def up(self) -> None:
+        self.y += PADDLE_STEP
+
+    def down(self) -> None:
+        self.y -= PADDLE_STEP
+
+    def covers(self, y: float) -> bool:
+        """Return True if a ball at height y would hit this paddle."""
+        return self.y - PADDLE_HALF_HEIGHT < y < self.y + PADDLE_HALF_HEIGHT
+
+
+@dataclass
+class Ball:
+    """Ball position in court units and velocity in units per second."""
+
+    x: float = 0.0
+    y: float = 0.0
+    dx: float = BALL_SPEED
+    dy: float = -BALL_SPEED
+
+
+@dataclass
+class PongState:
+    """Everything needed to advance and draw one game."""
+
+    paddle_a: Paddle = field(default_factory=lambda: Paddle(-PADDLE_X))
+    paddle_b: Paddle = field(default_factory=lambda: Paddle(PADDLE_X))
+    ball: Ball = field(default_factory=Ball)
+    ticks: int = 0
+
+    def step(self, dt: float = FIXED_DT) -> None:
+        """Advance the ball by dt seconds, resolving every bounce on the way.
+
+        Collisions are swept: instead of checking where the ball ended up,
+        each step finds the time of impact with the walls, paddles and goal
+        lines along the ball's path, so large dt or fast balls never tunnel.
+        """
+        ball = self.ball
+        remaining = dt
+        for _ in range(MAX_IMPACTS_PER_STEP):
+            impact = self._next_impact(remaining)
+            if impact is None:
+                ball.x += ball.dx * remaining
+                ball.y += ball.dy * remaining
+                break
+            t, surface = impact
+            ball.x += ball.dx * t
+            ball.y += ball.dy * t
+            remaining -= t
+            self._resolve(surface)
+        else:
+            ball.x = min(max(ball.x, -GOAL_X), GOAL_X)
+            ball.y = min(max(ball.y, COURT_BOTTOM), COURT_TOP)
+        self.ticks += 1
+
+    def _next_impact(self, horizon: float) -> tuple[float, str] | None:
+        """Return (time, surface) of the first impact within horizon, if any."""
+        ball = self.ball
+        hits: list[tuple[float, str]] = []
+
+        # Border checking
+        if ball.dy > 0:
+            hits.append(((COURT_TOP - ball.y) / ball.dy, "top"))
+        elif ball.dy < 0:
+            hits.append(((COURT_BOTTOM - ball.y) / ball.dy, "bottom"))
+
+        # Paddle and ball collisions: crossing the paddle face only counts
+        # if the paddle covers the height the ball crosses at.
+        if ball.dx > 0:
+            paddle, name, side = self.paddle_b, "paddle_b", 1
+        elif ball.dx < 0:
+            paddle, name, side = self.paddle_a, "paddle_a", -1
+        else:
+            paddle = None
+        if paddle is not None:
+            face, goal = side * PADDLE_FACE_X, side * GOAL_X
+            t_face = (face - ball.x) / ball.dx
+            if t_face >= 0 and paddle.covers(ball.y + ball.dy * t_face):
+                hits.append((t_face, name))
+            hits.append(((goal - ball.x) / ball.dx, "goal"))
+
+        hits = [(max(0.0, t), surface) for t, surface in hits if t <= horizon]
+        if not hits:
+            return None
+        return min(hits, key=lambda hit: (hit[0], IMPACT_ORDER[hit[1]]))
+
+    def _resolve(self, surface: str) -> None:
+        ball = self.ball
+        if surface == "top":
+            ball.y = COURT_TOP
+            ball.dy *= -1
+        elif surface == "bottom":
+            ball.y = COURT_BOTTOM
+            ball.dy *= -1
+        elif surface == "paddle_b":
+            ball.x = PADDLE_FACE_X
+            ball.dx *= -1
+        elif surface == "paddle_a":
+            ball.x = -PADDLE_FACE_X
+            ball.dx *= -1
+        elif surface == "goal":
+            ball.x, ball.y = 0.0, 0.0
+            ball.dx *= -1
+
+
+class FixedTimestep:
+    """Turn wall-clock time into a whole number of fixed physics ticks."""
+
+    def __init__(
+        self, dt: float = FIXED_DT, *, max_ticks: int = MAX_TICKS_PER_FRAME
+    ) -> None:
+        self.dt = dt
+        self.max_ticks = max_ticks
+        self._accumulator = 0.0
+        self._last: float | None = None
+
+    def advance(self, now: float) -> int:
+        """Return how many ticks to simulate to catch up to `now` (seconds)."""
+        if self._last is None:
+            self._last = now
+            return 0
+        self._accumulator += max(0.0, now - self._last)
+        self._last = now
+        ticks = int(self._accumulator / self.dt)
+        self._accumulator -= ticks * self.dt
+        if ticks > self.max_ticks:
+            # Drop the backlog instead of spiralling after a long pause.
+            ticks = self.max_ticks
+            self._accumulator = 0.0
+        return ticks
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""UDP networking for two-player Pong.
+
+The host runs the authoritative pong_core.PongState and streams compact
+binary snapshots to the joining player. Snapshots are delta-compressed
+against the last snapshot the client acknowledged, so a typical packet only
+carries the ball position. The client sends its paddle as a cumulative step
+count, which makes lost or reordered input packets harmless, predicts its own
+paddle locally, and draws the rest of the court interpolated a little in the
+past between received snapshots.
+
+Run `pong_net.py loopback` to exercise server and client on this machine
+with simulated packet loss and delay.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import random
+import socket
+import struct
+import time
+from dataclasses import dataclass, field
+
+from pong_core import FIXED_DT, PADDLE_STEP, PongState
+
+DEFAULT_PORT = 50505
+# The server sends one snapshot every SEND_EVERY physics ticks (30 Hz).
+SEND_EVERY = 2
+# How often the client repeats its input/ack packet even with no key presses.
+INPUT_INTERVAL = 1 / 30
+# The client draws remote objects this far behind the newest snapshot.
+INTERP_DELAY = 0.1
+# Snapshots kept on each side for delta bases.
+HISTORY = 128
+# Ball jumps larger than this between snapshots (a goal reset) are not
+# interpolated.
+SNAP_DISTANCE = 100.0
+
+HELLO, INPUT, STATE = 0, 1, 2
+# type, mask, seq, base offset (0 = keyframe), echoed client clock (ms)
+STATE_HEADER = struct.Struct("!BBIBI")
+# type, input seq, acked state seq, paddle steps, client clock (ms)
+INPUT_PACKET = struct.Struct("!BIIiI")
+FIELD = struct.Struct("!h")
+# ball_x, ball_y, ball_dx, ball_dy, paddle_a, paddle_b
+FIELD_COUNT = 6
+FULL_MASK = (1 << FIELD_COUNT) - 1
+# Positions travel as int16 in 1/POS_SCALE units; paddles as whole steps.
+POS_SCALE = 8
+
+
+def quantize(state: PongState) -> tuple[int, ...]:
+    """Pack the drawable game state into the integers sent on the wire."""
+    ball = state.ball
+    return (
+        round(ball.x * POS_SCALE),
+        round(ball.y * POS_SCALE),
+        round(ball.dx),
+        round(ball.dy),
+        round(state.paddle_a.y / PADDLE_STEP),
+        round(state.paddle_b.y / PADDLE_STEP),
+    )
+
+
+def encode_state(
+    seq: int,
+    snapshot: tuple[int, ...],
+    base_seq: int | None,
+    base: tuple[int, ...] | None,
+    echo_ms: int,
+) -> bytes:
+    """Encode a snapshot, sending only fields that differ from `base`."""
+    if base is None or base_seq is None or not 0 < seq - base_seq <= 255:
+        mask, offset = FULL_MASK, 0
+    else:
+        mask = 0
+        for idx, (new, old) in enumerate(zip(snapshot, base)):
+            if new != old:
+                mask |= 1 << idx
+        offset = seq - base_seq
+    parts = [STATE_HEADER.pack(STATE, mask, seq, offset, echo_ms)]
+    for idx, value in enumerate(snapshot):
+        if mask & (1 << idx):
+            parts.append(FIELD.pack(max(-32768, min(32767, value))))
+    return b"".join(parts)
+
+
+def decode_state(
+    packet: bytes, history: dict[int, tuple[int, ...]]
+) -> tuple[int, tuple[int, ...], int] | None:
+    """Return (seq, snapshot, echo_ms), or None if the delta base is unknown."""
+    _, mask, seq, offset, echo_ms = STATE_HEADER.unpack_from(packet)
+    if offset:
+        base = history.get(seq - offset)
+        if base is None:
+            return None
+        values = list(base)
+    else:
+        values = [0] * FIELD_COUNT
+    pos = STATE_HEADER.size
+    for idx in range(FIELD_COUNT):
+        if mask & (1 << idx):
+            (values[idx],) = FIELD.unpack_from(packet, pos)
+            pos += FIELD.size
+    return seq, tuple(values), echo_ms
+
+
+def _clock_ms() -> int:
+    return int(time.monotonic() * 1000) & 0xFFFFFFFF
+
+
+@dataclass
+class NetStats:
+    """Traffic counters and latency estimate for one endpoint."""
+
+    started: float = field(default_factory=time.monotonic)
+    bytes_in: int = 0
+    bytes_out: int = 0
+    packets_in: int = 0
+    packets_out: int = 0
+    rtt: float | None = None
+    expected: int = 0
+    received: int = 0
+
+    def record_rtt(self, sample: float) -> None:
+        self.rtt = sample if self.rtt is None else 0.9 * self.rtt + 0.1 * sample
+
+    def summary(self) -> str:
+        elapsed = max(1e-6, time.monotonic() - self.started)
+        text = (
+            f"down {self.bytes_in / elapsed / 1024:.1f} kB/s"
+            f" | up {self.bytes_out / elapsed / 1024:.1f} kB/s"
+        )
+        if self.rtt is not None:
+            text = f"RTT {self.rtt * 1000:.0f} ms | " + text
+        if self.expected:
+            loss = max(0.0, 1 - self.received / self.expected)
+            text += f" | loss {loss:.0%}"
+        return text
+
+
+class LossyChannel:
+    """Outgoing UDP that can drop and delay packets to mimic a bad network."""
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        stats: NetStats,
+        *,
+        loss: float = 0.0,
+        delay: float = 0.0,
+        jitter: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.sock = sock
+        self.stats = stats
+        self.loss = loss
+        self.delay = delay
+        self.jitter = jitter
+        self.dropped = 0
+        self._rng = random.Random(seed)
+        self._queue: list[tuple[float, int, bytes, tuple]] = []
+        self._order = 0
+
+    def sendto(self, data: bytes, addr: tuple) -> None:
+        self.stats.packets_out += 1
+        self.stats.bytes_out += len(data)
+        if self.loss and self._rng.random() < self.loss:
+            self.dropped += 1
+            return
+        if not self.delay and not self.jitter:
+            self._send(data, addr)
+            return
+        due = time.monotonic() + self.delay + self._rng.uniform(0, self.jitter)
+        self._order += 1
+        heapq.heappush(self._queue, (due, self._order, data, addr))
+
+    def flush(self) -> None:
+        """Send every delayed packet whose time has come."""
+        now = time.monotonic()
+        while self._queue and self._queue[0][0] <= now:
+            _, _, data, addr = heapq.heappop(self._queue)
+            self._send(data, addr)
+
+    def _send(self, data: bytes, addr: tuple) -> None:
+        try:
+            self.sock.sendto(data, addr)
+        except OSError:
+            pass
+
+
+def _open_socket(bind: tuple[str, int]) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(bind)
+    sock.setblocking(False)
+    return sock
+
+
+def _receive(sock: socket.socket, stats: NetStats):
+    """Yield (packet, addr) for everything waiting on a non-blocking socket."""
+    while True:
+        try:
+            packet, addr = sock.recvfrom(2048)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            # e.g. an ICMP "port unreachable" from a peer that went away;
+            # try again on the next poll.
+            return
+        stats.packets_in += 1
+        stats.bytes_in += len(packet)
+        yield packet, addr
+
+
+class NetServer:
+    """Authoritative host: owns the PongState, player B joins over UDP."""
+
+    def __init__(
+        self,
+        state: PongState,
+        *,
+        host: str = "0.0.0.0",
+        port: int = DEFAULT_PORT,
+        loss: float = 0.0,
+        delay: float = 0.0,
+        jitter: float = 0.0,
+    ) -> None:
+        self.state = state
+        self.stats = NetStats()
+        self.sock = _open_socket((host, port))
+        self.address = self.sock.getsockname()
+        self.channel = LossyChannel(
+            self.sock, self.stats, loss=loss, delay=delay, jitter=jitter
+        )
+        self.peer: tuple | None = None
+        self.history: dict[int, tuple[int, ...]] = {}
+        self._acked: int | None = None
+        self._input_seq = -1
+        self._echo_ms = 0
+        self._echo_at = 0.0
+
+    def poll(self) -> None:
+        """Apply waiting client packets and send due delayed packets."""
+        for packet, addr in _receive(self.sock, self.stats):
+            kind = packet[0]
+            if kind == HELLO:
+                self.peer = addr
+                self._acked = None
+                self._input_seq = -1
+            elif kind == INPUT and addr == self.peer:
+                if len(packet) < INPUT_PACKET.size:
+                    continue
+                _, seq, ack, steps, sent_ms = INPUT_PACKET.unpack_from(packet)
+                if seq > self._input_seq:
+                    self._input_seq = seq
+                    self.state.paddle_b.y = steps * PADDLE_STEP
+                    self._echo_ms = sent_ms
+                    self._echo_at = time.monotonic()
+                newer = self._acked is None or ack > self._acked
+                if ack in self.history and newer:
+                    self._acked = ack
+        self.channel.flush()
+
+    def broadcast(self) -> None:
+        """Send the current snapshot if this tick is a send tick."""
+        if self.peer is None or self.state.ticks % SEND_EVERY:
+            return
+        seq = self.state.ticks
+        snapshot = quantize(self.state)
+        self.history[seq] = snapshot
+        for old in [s for s in self.history if s < seq - HISTORY]:
+            del self.history[old]
+        base = self.history.get(self._acked) if self._acked is not None else None
+        # Echo the client's clock, advanced by how long we sat on it, so the
+        # client's RTT estimate excludes our tick scheduling delay.
+        held_ms = int((time.monotonic() - self._echo_at) * 1000)
+        echo = (self._echo_ms + held_ms) & 0xFFFFFFFF if self._echo_ms else 0
+        packet = encode_state(seq, snapshot, self._acked, base, echo)
+        self.channel.sendto(packet, self.peer)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class NetClient:
+    """Joining player: predicts paddle B, interpolates everything else."""
+
+    def __init__(
+        self,
+        server: tuple[str, int],
+        *,
+        loss: float = 0.0,
+        delay: float = 0.0,
+        jitter: float = 0.0,
+    ) -> None:
+        self.server = server
+        self.stats = NetStats()
+        self.sock = _open_socket(("0.0.0.0", 0))
+        self.channel = LossyChannel(
+            self.sock, self.stats, loss=loss, delay=delay, jitter=jitter
+        )
+        self.steps = 0
+        self.snapshots: dict[int, tuple[int, ...]] = {}
+        self._seqs: list[int] = []
+        self._arrivals: dict[int, float] = {}
+        self._offset: float | None = None
+        self._input_seq = 0
+        self._last_input = 0.0
+        self._first_seq: int | None = None
+        self.undecodable = 0
+
+    @property
+    def connected(self) -> bool:
+        return bool(self._seqs)
+
+    @property
+    def latest(self) -> int | None:
+        return self._seqs[-1] if self._seqs else None
+
+    def press(self, delta: int) -> None:
+        """Move our paddle by delta steps; takes effect locally at once."""
+        self.steps += delta
+        self._send_input()
+
+    def poll(self) -> None:
+        """Read snapshots from the server and keep our input flowing."""
+        now = time.monotonic()
+        for packet, addr in _receive(self.sock, self.stats):
+            if packet[0] != STATE or len(packet) < STATE_HEADER.size:
+                continue
+            decoded = decode_state(packet, self.snapshots)
+            if decoded is None:
+                self.undecodable += 1
+                continue
+            seq, snapshot, echo_ms = decoded
+            if seq in self.snapshots:
+                continue
+            self._store(seq, snapshot, now)
+            if echo_ms:
+                rtt_ms = (_clock_ms() - echo_ms) & 0xFFFFFFFF
+                self.stats.record_rtt(rtt_ms / 1000)
+        if not self.connected:
+            if now - self._last_input >= 0.25:
+                self.channel.sendto(bytes([HELLO]), self.server)
+                self._last_input = now
+        elif now - self._last_input >= INPUT_INTERVAL:
+            self._send_input()
+        self.channel.flush()
+
+    def _store(self, seq: int, snapshot: tuple[int, ...], now: float) -> None:
+        self.snapshots[seq] = snapshot
+        bisect.insort(self._seqs, seq)
+        self._arrivals[seq] = now
+        server_time = seq * FIXED_DT
+        offset = now - server_time
+        if self._offset is None or offset < self._offset:
+            self._offset = offset
+        if self._first_seq is None or seq < self._first_seq:
+            self._first_seq = seq
+        self.stats.received += 1
+        self.stats.expected = (self._seqs[-1] - self._first_seq) // SEND_EVERY + 1
+        while self._seqs and self._seqs[0] < self._seqs[-1] - 2 * HISTORY:
+            old = self._seqs.pop(0)
+            del self.snapshots[old]
+            del self._arrivals[old]
+
+    def _send_input(self) -> None:
+        self._input_seq += 1
+        ack = self.latest if self.latest is not None else 0
+        packet = INPUT_PACKET.pack(
+            INPUT, self._input_seq, ack, self.steps, _clock_ms()
+        )
+        self.channel.sendto(packet, self.server)
+        self._last_input = time.monotonic()
+
+    def view(self) -> tuple[float, float, float, float] | None:
+        """Return (ball_x, ball_y, paddle_a_y, paddle_b_y) to draw right now."""
+        if not self._seqs or self._offset is None:
+            return None
+        render_tick = (time.monotonic() - self._offset - INTERP_DELAY) / FIXED_DT
+        idx = bisect.bisect_right(self._seqs, render_tick)
+        if idx == 0:
+            before = after = self._seqs[0]
+        elif idx == len(self._seqs):
+            before = after = self._seqs[-1]
+        else:
+            before, after = self._seqs[idx - 1], self._seqs[idx]
+        old, new = self.snapshots[before], self.snapshots[after]
+        ball_x0, ball_y0 = old[0] / POS_SCALE, old[1] / POS_SCALE
+        ball_x1, ball_y1 = new[0] / POS_SCALE, new[1] / POS_SCALE
+        if after == before or abs(ball_x1 - ball_x0) > SNAP_DISTANCE:
+            frac = 0.0 if render_tick < after else 1.0
+        else:
+            frac = min(1.0, max(0.0, (render_tick - before) / (after - before)))
+        ball_x = ball_x0 + (ball_x1 - ball_x0) * frac
+        ball_y = ball_y0 + (ball_y1 - ball_y0) * frac
+        paddle_a = (old[4] if frac < 0.5 else new[4]) * PADDLE_STEP
+        # Our own paddle is predicted, never waited on.
+        return ball_x, ball_y, paddle_a, self.steps * PADDLE_STEP
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def parse_address(text: str) -> tuple[str, int]:
+    """Turn 'host[:port]' into a socket address."""
+    host, _, port = text.rpartition(":")
+    if not host:
+        return text, DEFAULT_PORT
+    return host, int(port)
+
+
+def loopback(
+    seconds: float, *, loss: float, delay: float, jitter: float, seed: int
+) -> int:
+    """Run a server and client against each other on localhost.
+
+    The client presses random keys; at the end every snapshot the client
+    decoded must match what the server sent for that tick, and the server's
+    paddle B must have converged to the client's prediction.
+    """
+    rng = random.Random(seed)
+    state = PongState()
+    link = {"loss": loss, "delay": delay, "jitter": jitter}
+    server = NetServer(state, host="127.0.0.1", port=0, **link)
+    client = NetClient(server.address, **link)
+    sent: dict[int, tuple[int, ...]] = {}
+    next_tick = time.monotonic()
+    end = next_tick + seconds
+    try:
+        while time.monotonic() < end:
+            client.poll()
+            server.poll()
+            now = time.monotonic()
+            while now >= next_tick:
+                state.step(FIXED_DT)
+                server.broadcast()
+                if state.ticks in server.history:
+                    sent[state.ticks] = server.history[state.ticks]
+                next_tick += FIXED_DT
+            if client.connected and rng.random() < 0.02:
+                client.press(rng.choice((-1, 1)))
+            time.sleep(0.001)
+        # Let the last input reach the server.
+        settle = time.monotonic() + delay + jitter + 0.5
+        while time.monotonic() < settle:
+            client.poll()
+            server.poll()
+            client._send_input()
+            time.sleep(0.01)
+            if state.paddle_b.y == client.steps * PADDLE_STEP:
+                break
+    finally:
+        client.close()
+        server.close()
+
+    mismatches = sum(
+        1 for seq, snap in client.snapshots.items() if sent.get(seq) != snap
+    )
+    converged = state.paddle_b.y == client.steps * PADDLE_STEP
+    packets = max(1, server.stats.packets_out)
+    full_size = STATE_HEADER.size + FIELD_COUNT * FIELD.size
+    print(
+        f"Simulated network: loss {loss:.0%}, delay {delay * 1000:.0f} ms"
+        f" (+{jitter * 1000:.0f} ms jitter)"
+    )
+    print(
+        f"Server sent {server.stats.packets_out} snapshots, "
+        f"{server.stats.bytes_out / packets:.1f} bytes each on average "
+        f"(full snapshot {full_size} bytes)"
+    )
+    print(
+        f"Client decoded {len(client.snapshots)} kept snapshots, "
+        f"{client.undecodable} undecodable, {mismatches} mismatched"
+    )
+    print(f"Client: {client.stats.summary()}")
+    print(f"Server: {server.stats.summary()}")
+    print(f"Paddle B converged: {'yes' if converged else 'no'}")
+    return 0 if mismatches == 0 and converged else 1
+
+
+def main(argv: list[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pong networking test harness.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    loop = sub.add_parser(
+        "loopback", help="Run server and client locally over a lossy link."
+    )
+    loop.add_argument("--seconds", type=float, default=5.0)
+    loop.add_argument("--loss", type=float, default=0.1, help="Drop probability.")
+    loop.add_argument(
+        "--delay", type=float, default=0.05, help="One-way delay in seconds."
+    )
+    loop.add_argument(
+        "--jitter", type=float, default=0.02, help="Extra random delay in seconds."
+    )
+    loop.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    return loopback(
+        args.seconds,
+        loss=args.loss,
+        delay=args.delay,
+        jitter=args.jitter,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    raise SystemExit(main(sys.argv[1:]))
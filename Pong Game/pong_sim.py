@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Headless, vectorized Pong: step thousands of games at once with NumPy.
+
+Every game follows the same rules as pong_core.PongState (swept wall, paddle
+and goal impacts), but the state of all games lives in flat arrays so one
+step is a handful of array operations instead of a Python loop per ball.
+Any single game can be watched with the turtle viewer (--view INDEX).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+
+from pong_core import (
+    BALL_SPEED,
+    COURT_BOTTOM,
+    COURT_TOP,
+    FIXED_DT,
+    GOAL_X,
+    MAX_IMPACTS_PER_STEP,
+    PADDLE_FACE_X,
+    PADDLE_HALF_HEIGHT,
+    PADDLE_STEP,
+    PADDLE_X,
+)
+
+# A policy looks at the batch and returns per-game moves (-1, 0 or +1 paddle
+# steps) for paddle A and paddle B.
+Policy = Callable[["BatchPong"], "tuple[np.ndarray, np.ndarray]"]
+
+
+class BatchPong:
+    """Ball and paddle state for n independent games."""
+
+    def __init__(
+        self, n: int, *, seed: int | None = None, speed: float = BALL_SPEED
+    ) -> None:
+        rng = np.random.default_rng(seed)
+        self.n = n
+        self.rng = rng
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        # Same serve as pong.py, with the direction randomized per game.
+        self.dx = speed * rng.choice([-1.0, 1.0], size=n)
+        self.dy = speed * rng.choice([-1.0, 1.0], size=n)
+        self.paddle_a = np.zeros(n)
+        self.paddle_b = np.zeros(n)
+        self.hits_a = np.zeros(n, dtype=np.int64)
+        self.hits_b = np.zeros(n, dtype=np.int64)
+        self.goals_a = np.zeros(n, dtype=np.int64)
+        self.goals_b = np.zeros(n, dtype=np.int64)
+        self.ticks = 0
+
+    def move_paddles(self, moves_a: np.ndarray, moves_b: np.ndarray) -> None:
+        """Apply one round of paddle key presses (-1 down, 0 idle, +1 up)."""
+        self.paddle_a += PADDLE_STEP * moves_a
+        self.paddle_b += PADDLE_STEP * moves_b
+
+    def step(self, dt: float = FIXED_DT) -> None:
+        """Advance every game by dt seconds with swept collisions."""
+        x, y, dx, dy = self.x, self.y, self.dx, self.dy
+        remaining = np.full(self.n, dt, dtype=float)
+        active = np.ones(self.n, dtype=bool)
+        inf = np.inf
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(MAX_IMPACTS_PER_STEP):
+                # Border checking
+                t_wall = np.where(
+                    dy > 0,
+                    (COURT_TOP - y) / dy,
+                    np.where(dy < 0, (COURT_BOTTOM - y) / dy, inf),
+                )
+
+                # Paddle and ball collisions on whichever side the ball heads.
+                right = dx > 0
+                moving = dx != 0
+                face = np.where(right, PADDLE_FACE_X, -PADDLE_FACE_X)
+                goal = np.where(right, GOAL_X, -GOAL_X)
+                paddle_y = np.where(right, self.paddle_b, self.paddle_a)
+                t_face = (face - x) / dx
+                cross_y = y + dy * t_face
+                covered = np.abs(cross_y - paddle_y) < PADDLE_HALF_HEIGHT
+                t_face = np.where(moving & (t_face >= 0) & covered, t_face, inf)
+                t_goal = np.where(moving, (goal - x) / dx, inf)
+
+                t = np.maximum(np.minimum(np.minimum(t_wall, t_face), t_goal), 0.0)
+                hit = active & (t <= remaining)
+                # Balls with no impact left fly out the rest of their step.
+                advance = np.where(hit, t, np.where(active, remaining, 0.0))
+                x += dx * advance
+                y += dy * advance
+                remaining -= advance
+                active = hit
+                if not active.any():
+                    break
+
+                # Same tie-break as pong_core: walls, then paddles, then goals.
+                wall = hit & (np.maximum(t_wall, 0.0) == t)
+                paddle = hit & ~wall & (np.maximum(t_face, 0.0) == t)
+                scored = hit & ~wall & ~paddle
+
+                y[wall] = np.where(dy[wall] > 0, COURT_TOP, COURT_BOTTOM)
+                dy[wall] *= -1
+
+                x[paddle] = face[paddle]
+                self.hits_b += paddle & right
+                self.hits_a += paddle & ~right
+                dx[paddle] *= -1
+
+                self.goals_a += scored & right
+                self.goals_b += scored & ~right
+                x[scored] = 0.0
+                y[scored] = 0.0
+                dx[scored] *= -1
+            else:
+                np.clip(x, -GOAL_X, GOAL_X, out=x, where=active)
+                np.clip(y, COURT_BOTTOM, COURT_TOP, out=y, where=active)
+
+        self.ticks += 1
+
+
+def tracking_policy(sim: BatchPong) -> tuple[np.ndarray, np.ndarray]:
+    """Both paddles chase the ball's height."""
+
+    def chase(paddle: np.ndarray) -> np.ndarray:
+        gap = sim.y - paddle
+        return np.where(np.abs(gap) > PADDLE_STEP / 2, np.sign(gap), 0.0)
+
+    return chase(sim.paddle_a), chase(sim.paddle_b)
+
+
+def random_policy(sim: BatchPong) -> tuple[np.ndarray, np.ndarray]:
+    """Mash keys at random."""
+    moves = sim.rng.integers(-1, 2, size=(2, sim.n)).astype(float)
+    return moves[0], moves[1]
+
+
+def idle_policy(sim: BatchPong) -> tuple[np.ndarray, np.ndarray]:
+    """Never touch the paddles."""
+    still = np.zeros(sim.n)
+    return still, still
+
+
+POLICIES: dict[str, Policy] = {
+    "track": tracking_policy,
+    "random": random_policy,
+    "idle": idle_policy,
+}
+
+
+def run(
+    sim: BatchPong,
+    ticks: int,
+    policy: Policy,
+    *,
+    dt: float = FIXED_DT,
+    decide_every: int = 2,
+) -> float:
+    """Step the batch for `ticks` ticks and return the elapsed seconds.
+
+    The policy is consulted every `decide_every` ticks, roughly the rate of
+    keyboard auto-repeat in the interactive game.
+    """
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if tick % decide_every == 0:
+            sim.move_paddles(*policy(sim))
+        sim.step(dt)
+    return time.perf_counter() - start
+
+
+def view(
+    sim: BatchPong,
+    index: int,
+    policy: Policy,
+    *,
+    dt: float = FIXED_DT,
+    decide_every: int = 2,
+) -> None:
+    """Render game `index` of the batch in a turtle window while it runs."""
+    import turtle
+
+    wn = turtle.Screen()
+    wn.title(f"Pong simulator - game {index} of {sim.n}")
+    wn.bgcolor("black")
+    wn.setup(width=800, height=600)
+    wn.tracer(0)
+
+    def make(shape: str, x: float) -> turtle.Turtle:
+        item = turtle.Turtle()
+        item.speed(0)
+        item.shape(shape)
+        item.color("white")
+        if shape == "square":
+            item.shapesize(stretch_wid=5, stretch_len=1)
+        item.penup()
+        item.goto(x, 0)
+        return item
+
+    paddle_a = make("square", -PADDLE_X)
+    paddle_b = make("square", PADDLE_X)
+    ball = make("circle", 0)
+    frame_ms = max(1, int(dt * 1000))
+
+    def frame() -> None:
+        if sim.ticks % decide_every == 0:
+            sim.move_paddles(*policy(sim))
+        sim.step(dt)
+        paddle_a.sety(sim.paddle_a[index])
+        paddle_b.sety(sim.paddle_b[index])
+        ball.goto(sim.x[index], sim.y[index])
+        wn.update()
+        wn.ontimer(frame, frame_ms)
+
+    frame()
+    wn.mainloop()
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Simulate many Pong games at once without a window."
+    )
+    parser.add_argument(
+        "--games", type=int, default=10_000, help="Number of games to simulate."
+    )
+    parser.add_argument(
+        "--ticks", type=int, default=600, help="Physics ticks to run per game."
+    )
+    parser.add_argument(
+        "--dt", type=float, default=FIXED_DT, help="Seconds simulated per tick."
+    )
+    parser.add_argument(
+        "--policy",
+        choices=sorted(POLICIES),
+        default="track",
+        help="Paddle controller used for both players.",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for serves and policies.")
+    parser.add_argument(
+        "--view",
+        type=int,
+        metavar="INDEX",
+        help="Open a turtle window showing game INDEX instead of benchmarking.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    if args.games < 1 or args.ticks < 0:
+        print(
+            "Error: need at least one game and a non-negative tick count.",
+            file=sys.stderr,
+        )
+        return 2
+    sim = BatchPong(args.games, seed=args.seed)
+    policy = POLICIES[args.policy]
+
+    if args.view is not None:
+        if not 0 <= args.view < args.games:
+            print(
+                f"Error: --view must be between 0 and {args.games - 1}.",
+                file=sys.stderr,
+            )
+            return 2
+        view(sim, args.view, policy, dt=args.dt)
+        return 0
+
+    elapsed = run(sim, args.ticks, policy, dt=args.dt)
+    frames = args.games * args.ticks
+    rate = frames / elapsed if elapsed > 0 else float("inf")
+    print(f"Simulated {args.games} games x {args.ticks} ticks in {elapsed:.3f}s")
+    print(f"Throughput: {rate:,.0f} simulated frames/s")
+    print(
+        f"Paddle hits: {int(sim.hits_a.sum() + sim.hits_b.sum())}, "
+        f"goals: A {int(sim.goals_a.sum())} / B {int(sim.goals_b.sum())}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
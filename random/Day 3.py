@@ -8,6 +8,8 @@ class random_num_gen:
         random_integer_2 = random.randint(1, self.range_max)
         return random_integer_1, random_integer_2   
 
-range_max = int(input("Press enter the max limit of the range: "))
-rng = random_num_gen(range_max)
-print(f"First random number is {random_integer_1}, and second random number is {random_integer_2} and the product of both is {random_integer_1 * random_integer_2}")
\ No newline at end of file
+if __name__ == "__main__":
+    range_max = int(input("Press enter the max limit of the range: "))
+    rng = random_num_gen(range_max)
+    random_integer_1, random_integer_2 = rng.generate_random_numbers()
+    print(f"First random number is {random_integer_1}, and second random number is {random_integer_2} and the product of both is {random_integer_1 * random_integer_2}")
@@ -23,7 +23,8 @@ def findErrorNums(nums):
 
 
 # -------- TESTS --------
-print(findErrorNums([1, 2, 2, 4]))
-# print(findErrorNums([1, 1]))
-# print(findErrorNums([2, 2]))
-# print(findErrorNums([1, 2, 3, 3]))
\ No newline at end of file
+if __name__ == "__main__":
+    print(findErrorNums([1, 2, 2, 4]))
+    # print(findErrorNums([1, 1]))
+    # print(findErrorNums([2, 2]))
+    # print(findErrorNums([1, 2, 3, 3]))
@@ -1,24 +1,90 @@
 # Count prime numbers up to n (optimized version using previous primes)
+#
+# --method sieve and --method lucy use prime_sieve.py and prime_count.py,
+# which handle n in the billions; --check compares every method on small n.
+import sys
 import time
 
-n = int(input("Enter a number: "))
 
-start = time.time()
+def count_primes(n):
+    primes = []
 
-primes = []
+    for num in range(2, n + 1):
+        is_prime = True
+        for p in primes:
+            if p * p > num:
+                break
+            if num % p == 0:
+                is_prime = False
+                break
+        if is_prime:
+            primes.append(num)
 
-for num in range(2, n + 1):
-    is_prime = True
-    for p in primes:
-        if p * p > num:
-            break
-        if num % p == 0:
-            is_prime = False
-            break
-    if is_prime:
-        primes.append(num)
+    return len(primes)
 
-end = time.time()
 
-print(f"\nTotal prime numbers up to {n}: {len(primes)}")
-print(f"Elapsed time: {end - start:.6f} seconds")
\ No newline at end of file
+def count_with(method, n):
+    if method == "incremental":
+        return count_primes(n)
+    if method == "sieve":
+        import prime_sieve
+
+        return prime_sieve.count_primes(n)
+    import prime_count
+
+    return prime_count.lucy(n)
+
+
+def check(limit=10**6):
+    # lucy against the sieve on random n up to limit, then every method
+    # against the sieve for all n below 200 and a few larger ones (the
+    # incremental loop is too slow to go much past 20000).
+    import prime_count
+
+    small = min(limit, 20000)
+    print(f"Checking lucy up to {limit} and every method up to {small}...")
+    bad = prime_count.check(limit=limit)
+    if bad:
+        print(f"lucy and sieve disagree for n in {bad[:10]}")
+        return 1
+    ns = [*range(200), 1000, 7919, 7920, small]
+    for n in sorted({n for n in ns if n <= small}):
+        expected = count_with("sieve", n)
+        for method in ("incremental", "lucy"):
+            got = count_with(method, n)
+            if got != expected:
+                print(f"{method} gives {got} for n={n}, sieve gives {expected}")
+                return 1
+    print("All methods agree.")
+    return 0
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Count prime numbers up to n.")
+    parser.add_argument("n", nargs="?", type=int, help="Upper limit (prompted for if omitted).")
+    parser.add_argument(
+        "--method",
+        choices=("incremental", "sieve", "lucy"),
+        default="incremental",
+        help="incremental (this file), sieve (prime_sieve.py) or lucy (prime_count.py).",
+    )
+    parser.add_argument("--check", action="store_true", help="Cross-check the methods and exit.")
+    args = parser.parse_args(argv)
+    if args.check:
+        return check()
+
+    n = args.n if args.n is not None else int(input("Enter a number: "))
+
+    start = time.time()
+    count = count_with(args.method, n)
+    end = time.time()
+
+    print(f"\nTotal prime numbers up to {n}: {count}")
+    print(f"Elapsed time: {end - start:.6f} seconds")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,165 @@
+# Benchmark the prime counting methods as n grows
+#
+# Times each method for n = 10^2, 10^3, ... and prints one row per n plus the
+# scaling exponent between successive sizes (time ~ n^slope, so 1.5 means
+# ten times the n costs about 30 times the time). A method is dropped once its
+# next run is projected to take longer than --budget seconds, so the slow ones
+# don't stall the sweep. --csv and --plot save the curves.
+#
+#   python prime_bench.py --max-exp 10
+#   python prime_bench.py --plot prime_bench.png
+import importlib.util
+import math
+import sys
+import time
+from pathlib import Path
+
+import prime
+import prime_count
+import prime_sieve
+
+
+def load_prime_old():
+    # "prime old.py" has a space in its name, so it cannot be imported normally.
+    path = Path(__file__).with_name("prime old.py")
+    spec = importlib.util.spec_from_file_location("prime_old", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def methods():
+    return {
+        "trial": load_prime_old().count_primes,
+        "incremental": prime.count_primes,
+        "sieve": prime_sieve.count_primes,
+        "lucy": prime_count.lucy,
+    }
+
+
+def best_time(func, n, repeat):
+    best, result = math.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(n)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def projected(points, n):
+    # Extrapolate the last two timings to n, assuming at least linear growth.
+    if not points:
+        return 0.0
+    n1, t1 = points[-1]
+    slope = 1.0
+    if len(points) > 1 and points[-2][1] > 0:
+        n0, t0 = points[-2]
+        slope = max(slope, math.log(t1 / t0) / math.log(n1 / n0))
+    return t1 * (n / n1) ** slope
+
+
+def sweep(funcs, sizes, *, budget, repeat):
+    """{method: [(n, seconds), ...]}, checking every method gives the same count."""
+    curves = {name: [] for name in funcs}
+    for n in sizes:
+        counts = {}
+        for name, func in funcs.items():
+            points = curves[name]
+            if projected(points, n) > budget:
+                continue
+            # Only repeat runs that are quick enough for the noise to matter.
+            runs = repeat if not points or points[-1][1] < 0.1 else 1
+            seconds, counts[name] = best_time(func, n, runs)
+            points.append((n, seconds))
+        if len(set(counts.values())) > 1:
+            raise AssertionError(f"methods disagree at n={n}: {counts}")
+    return curves
+
+
+def format_table(curves, sizes):
+    names = list(curves)
+    lines = [f"{'n':>14}" + "".join(f"{name:>22}" for name in names)]
+    for n in sizes:
+        row = f"{n:>14}"
+        for name in names:
+            points = dict(curves[name])
+            prev = [m for m, _ in curves[name] if m < n]
+            if n not in points:
+                row += f"{'-':>22}"
+                continue
+            cell = f"{points[n]:.6f}s"
+            if prev and points[prev[-1]] > 0:
+                slope = math.log(points[n] / points[prev[-1]]) / math.log(n / prev[-1])
+                cell += f" (n^{slope:.2f})"
+            row += f"{cell:>22}"
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def write_csv(curves, path):
+    import csv
+
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["method", "n", "seconds"])
+        for name, points in curves.items():
+            writer.writerows([name, n, seconds] for n, seconds in points)
+
+
+def plot(curves, path):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    for name, points in curves.items():
+        plt.loglog([n for n, _ in points], [s for _, s in points], marker="o", label=name)
+    plt.title("Prime counting time vs. n")
+    plt.xlabel("n")
+    plt.ylabel("Seconds")
+    plt.grid(True, which="both", linestyle="--", alpha=0.7)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path)
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the prime counting methods.")
+    parser.add_argument("--min-exp", type=int, default=2, help="Smallest n is 10^this.")
+    parser.add_argument("--max-exp", type=int, default=9, help="Largest n is 10^this.")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=10.0,
+        help="Skip runs projected to take longer than this many seconds.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs.")
+    parser.add_argument(
+        "--methods", nargs="+", choices=list(methods()), help="Only these methods."
+    )
+    parser.add_argument("--csv", help="Write method,n,seconds rows here.")
+    parser.add_argument("--plot", help="Save a log-log PNG here (needs matplotlib).")
+    args = parser.parse_args(argv)
+
+    funcs = methods()
+    if args.methods:
+        funcs = {name: funcs[name] for name in args.methods}
+    sizes = [10**e for e in range(args.min_exp, args.max_exp + 1)]
+    curves = sweep(funcs, sizes, budget=args.budget, repeat=args.repeat)
+    print(format_table(curves, sizes))
+    if args.csv:
+        write_csv(curves, args.csv)
+    if args.plot:
+        try:
+            plot(curves, args.plot)
+        except ImportError:
+            print("matplotlib is not installed; skipping --plot", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,122 @@
+# Count prime numbers up to n without listing them (Lucy_Hedgehog's method)
+#
+# S(v) starts as the count of integers in [2, v] and, after sieving out the
+# multiples of each prime p <= sqrt(n), is the prime count pi(v). Only the
+# O(sqrt(n)) values v = n // i are ever needed, so the work is about
+# n^(3/4) / log(n) array operations instead of sieving all of [2, n]:
+# pi(10^12) takes a few seconds.
+#
+# lucy() runs in a single process: each prime's update reads the counts the
+# previous primes left, so the loop over p is sequential, and the per-p array
+# operations are too small to pay for shipping them to other processes. The
+# process pool (--workers) is used only by --sieve, which splits [2, n] into
+# ranges counted independently; that is also how lucy() is cross-checked.
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import isqrt
+
+import numpy as np
+
+import prime_sieve
+
+
+def lucy(n):
+    """pi(n), the number of primes <= n."""
+    if n < 2:
+        return 0
+    r = isqrt(n)
+    # small[v] = S(v) for v <= r; large[i] = S(n // i) for 1 <= i <= r.
+    small = np.arange(-1, r, dtype=np.int64)
+    small[0] = 0
+    large = np.zeros(r + 1, dtype=np.int64)
+    large[1:] = n // np.arange(1, r + 1, dtype=np.int64) - 1
+    for p in range(2, r + 1):
+        if small[p] == small[p - 1]:
+            continue  # p is not prime
+        below = small[p - 1]  # primes < p
+        p2 = p * p
+        # S(v) -= S(v // p) - S(p - 1) for every tracked v >= p * p. Each
+        # update reads only smaller v, which NumPy reads before writing.
+        last = min(r, n // p2)
+        direct = min(last, r // p)
+        # n // i // p = n // (i * p), which is in `large` while i * p <= r.
+        large[1 : direct + 1] -= large[p : direct * p + 1 : p] - below
+        if last > direct:
+            i = np.arange(direct + 1, last + 1, dtype=np.int64)
+            large[direct + 1 : last + 1] -= small[n // (i * p)] - below
+        if p2 <= r:
+            v = np.arange(p2, r + 1, dtype=np.int64)
+            small[p2:] -= small[v // p] - below
+    return int(large[1])
+
+
+def _count_range(bounds):
+    start, stop = bounds
+    return prime_sieve.count_primes(stop, start)
+
+
+def sieve_count(n, workers=None, chunk=None):
+    """pi(n) by sieving [2, n] in ranges across a process pool."""
+    if n < 2:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    if chunk is None:
+        # A few ranges per worker so uneven ones even out, but not so many
+        # that each range re-sieves its base primes for little work.
+        chunk = max(prime_sieve.SEGMENT_SIZE * 2, -(-n // (workers * 4)))
+    ranges = [(lo, min(lo + chunk - 1, n)) for lo in range(0, n + 1, chunk)]
+    if workers == 1 or len(ranges) == 1:
+        return sum(map(_count_range, ranges))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_count_range, ranges))
+
+
+def check(limit=10**6, samples=200, seed=0):
+    """Compare lucy() with the sieve; returns the n where they differ."""
+    rng = np.random.default_rng(seed)
+    ns = sorted(set(range(0, 200)) | set(rng.integers(0, limit, samples).tolist()))
+    ns.append(limit)
+    flags = np.zeros(limit + 1, dtype=np.int64)
+    for chunk in prime_sieve.iter_primes(limit):
+        flags[chunk] = 1
+    pi = np.cumsum(flags)
+    return [n for n in ns if lucy(n) != pi[n]]
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Count prime numbers up to n.",
+        epilog="Lucy's method (the default) runs in one process; only --sieve "
+        "uses a process pool.",
+    )
+    parser.add_argument(
+        "n", nargs="?", type=int, help="Upper limit (prompted for if omitted)."
+    )
+    parser.add_argument(
+        "--sieve",
+        action="store_true",
+        help="Sieve in parallel instead of using Lucy's method.",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Sieve processes with --sieve (default: CPUs)."
+    )
+    args = parser.parse_args(argv)
+    if args.workers is not None and not args.sieve:
+        parser.error("--workers needs --sieve; Lucy's method runs in one process")
+    n = args.n if args.n is not None else int(input("Enter a number: "))
+
+    start = time.time()
+    count = sieve_count(n, args.workers) if args.sieve else lucy(n)
+    end = time.time()
+
+    print(f"\nTotal prime numbers up to {n}: {count}")
+    print(f"Elapsed time: {end - start:.6f} seconds")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,151 @@
+# Count prime numbers up to n (segmented sieve of Eratosthenes on NumPy)
+#
+# Only odd numbers are stored, one byte each, and the range is processed one
+# fixed-size segment at a time, so memory stays at a few MB however large n
+# is. The multiples of 3, 5, 7, 11 and 13 repeat with a short period and are
+# copied in from a pre-sieved pattern instead of being struck out each time.
+#
+#   python prime_sieve.py 10000000000
+#   python prime_sieve.py 1000 --list
+import sys
+import time
+from math import isqrt
+
+import numpy as np
+
+# Odd numbers per segment: 1 MB of flags, which keeps the strike loop in cache
+# while still amortizing the per-prime Python overhead.
+SEGMENT_SIZE = 1 << 20
+WHEEL_PRIMES = (3, 5, 7, 11, 13)
+# Index k stands for the odd number 2k + 1, and striking the multiples of an
+# odd prime p repeats every p indexes, so the wheel pattern repeats every 15015.
+_WHEEL_PERIOD = 3 * 5 * 7 * 11 * 13
+
+
+def _odd_flags(limit):
+    # Plain odd-only sieve for the base primes: flags[k] says whether 2k + 1 is
+    # prime, for 2k + 1 <= limit.
+    flags = np.ones(limit // 2 + 1 if limit >= 1 else 0, dtype=bool)
+    if len(flags):
+        flags[0] = False
+    for p in range(3, isqrt(limit) + 1, 2):
+        if flags[p // 2]:
+            flags[p * p // 2 :: p] = False
+    return flags
+
+
+def base_primes(limit):
+    """Odd primes up to limit, as an int64 array."""
+    return 2 * np.flatnonzero(_odd_flags(limit)).astype(np.int64) + 1
+
+
+def _wheel_pattern(size):
+    # One wheel period of flags with the wheel primes' multiples struck out,
+    # repeated so that any window of `size` starting in the first period fits.
+    pattern = np.ones(_WHEEL_PERIOD, dtype=bool)
+    for p in WHEEL_PRIMES:
+        pattern[p // 2 :: p] = False
+    reps = -(-(size + _WHEEL_PERIOD) // _WHEEL_PERIOD)
+    return np.tile(pattern, reps)
+
+
+def segments(start, stop, segment_size=SEGMENT_SIZE):
+    """Yield (k0, flags) for the odd numbers in [start, stop).
+
+    flags[i] is True when 2 * (k0 + i) + 1 is prime. The array is reused for
+    the next segment, so copy anything you keep. The prime 2 is not included.
+    """
+    stop = max(stop, 0)
+    k_start = max(start, 0) // 2
+    k_stop = stop // 2  # odd numbers below stop are 2k + 1 for k < stop // 2
+    if k_start >= k_stop:
+        return
+    primes = base_primes(isqrt(stop - 1))
+    primes = primes[primes > WHEEL_PRIMES[-1]]
+    # Index of the next multiple of each prime to strike, starting at p * p
+    # (smaller multiples have a smaller prime factor) or in the first segment.
+    nxt = (primes * primes) // 2
+    behind = nxt < k_start
+    step = primes[behind]
+    nxt[behind] += (k_start - nxt[behind] + step - 1) // step * step
+    wheel = _wheel_pattern(segment_size)
+    flags = np.empty(segment_size, dtype=bool)
+    for k0 in range(k_start, k_stop, segment_size):
+        k1 = min(k0 + segment_size, k_stop)
+        size = k1 - k0
+        seg = flags[:size]
+        offset = k0 % _WHEEL_PERIOD
+        seg[:] = wheel[offset : offset + size]
+        if k0 == 0:
+            seg[0] = False  # 1 is not prime
+        if k0 <= WHEEL_PRIMES[-1] // 2:
+            # The pattern struck out the wheel primes themselves.
+            for p in WHEEL_PRIMES:
+                if k0 <= p // 2 < k1:
+                    seg[p // 2 - k0] = True
+        # Primes whose square is past this segment have nothing to strike yet.
+        active = int(np.searchsorted(primes, isqrt(2 * k1 - 1), side="right"))
+        live = nxt[:active]
+        for p, first in zip(primes[:active].tolist(), (live - k0).tolist()):
+            if first < size:
+                seg[first::p] = False
+        # Advance each prime to its first multiple in the next segment.
+        step = primes[:active]
+        live += np.maximum(k1 - live + step - 1, 0) // step * step
+        yield k0, seg
+
+
+def count_primes(stop, start=0, segment_size=SEGMENT_SIZE):
+    """Number of primes p with start <= p <= stop."""
+    if stop < 2 or start > stop:
+        return 0
+    count = 1 if start <= 2 else 0
+    for _, seg in segments(start, stop + 1, segment_size):
+        count += int(np.count_nonzero(seg))
+    return count
+
+
+def iter_primes(stop, start=0, segment_size=SEGMENT_SIZE):
+    """Yield the primes in [start, stop] as int64 arrays, one per segment."""
+    if stop >= 2 and start <= 2:
+        yield np.array([2], dtype=np.int64)
+    for k0, seg in segments(start, stop + 1, segment_size):
+        yield 2 * (np.flatnonzero(seg) + k0) + 1
+
+
+def primes_up_to(stop):
+    """All primes <= stop in one array (needs 8 bytes per prime)."""
+    chunks = list(iter_primes(stop))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Count prime numbers up to n.")
+    parser.add_argument("n", nargs="?", type=int, help="Upper limit (prompted for if omitted).")
+    parser.add_argument("--start", type=int, default=0, help="Only count primes >= this.")
+    parser.add_argument("--list", action="store_true", help="Print the primes as well.")
+    parser.add_argument(
+        "--segment-size", type=int, default=SEGMENT_SIZE, help="Odd numbers per segment."
+    )
+    args = parser.parse_args(argv)
+    n = args.n if args.n is not None else int(input("Enter a number: "))
+
+    start = time.time()
+    if args.list:
+        count = 0
+        for chunk in iter_primes(n, args.start, args.segment_size):
+            count += len(chunk)
+            print("\n".join(map(str, chunk.tolist())))
+    else:
+        count = count_primes(n, args.start, args.segment_size)
+    end = time.time()
+
+    print(f"\nTotal prime numbers up to {n}: {count}")
+    print(f"Elapsed time: {end - start:.6f} seconds")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
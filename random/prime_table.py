@@ -0,0 +1,219 @@
+# Persistent prime table with fast is_prime and nth_prime queries
+#
+# Primes found so far are kept in a .npy file that is memory-mapped on load,
+# so a query only touches the pages it needs and a later run starts where the
+# last one stopped instead of sieving from 2 again. The table grows by
+# doubling, up to MAX_LIMIT; beyond that is_prime uses a deterministic
+# Miller-Rabin test (up to MR_LIMIT) and nth_prime counts with
+# prime_count.lucy().
+#
+#   python prime_table.py is-prime 18446744073709551557
+#   python prime_table.py nth 1000000
+import json
+import os
+import sys
+import time
+from math import log
+from pathlib import Path
+
+import numpy as np
+
+import prime_count
+import prime_sieve
+
+TABLE_DIR = Path(
+    os.environ.get("PRIME_TABLE_DIR") or Path.home() / ".cache" / "pypractice-primes"
+)
+# Largest number the table will sieve to: ~50.8M primes, 203 MB as uint32.
+MAX_LIMIT = 10**9
+MIN_LIMIT = 10**6
+# These bases make Miller-Rabin exact for every n < MR_LIMIT (about 3.18 *
+# 10^23), so all 64-bit n; past it the test would only be probabilistic.
+MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+MR_LIMIT = 3317044064679887385961981
+
+
+def miller_rabin(n):
+    """Deterministic primality test for n < MR_LIMIT."""
+    if n >= MR_LIMIT:
+        raise ValueError(f"{n} is past the deterministic Miller-Rabin limit")
+    if n < 2:
+        return False
+    for p in MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+class PrimeTable:
+    def __init__(self, directory=TABLE_DIR, max_limit=MAX_LIMIT):
+        self.directory = Path(directory)
+        self.max_limit = max_limit
+        self._primes = None
+        self._limit = None
+
+    @property
+    def _path(self):
+        return self.directory / "primes.npy"
+
+    def _load(self):
+        # Every prime <= limit, in order; meta.json is written after the table.
+        try:
+            meta = json.loads((self.directory / "meta.json").read_text())
+            primes = np.load(self._path, mmap_mode="r")
+            if len(primes) != meta["count"]:
+                raise ValueError("table and meta.json disagree")
+        except (OSError, ValueError, KeyError):
+            primes, meta = np.empty(0, dtype=np.uint32), {"limit": 1}
+        self._primes, self._limit = primes, meta["limit"]
+
+    @property
+    def primes(self):
+        if self._primes is None:
+            self._load()
+        return self._primes
+
+    @property
+    def limit(self):
+        if self._limit is None:
+            self._load()
+        return self._limit
+
+    def extend(self, limit):
+        """Make sure the table holds every prime <= limit (capped at max_limit)."""
+        if limit <= self.limit:
+            return
+        # Grow geometrically so repeated small extensions stay cheap overall.
+        # uint32 entries keep the table at 4 bytes per prime.
+        cap = min(self.max_limit, 2**32 - 1)
+        limit = min(max(limit, 2 * self.limit, MIN_LIMIT), cap)
+        if limit <= self.limit:
+            return
+        # Stream each sieved segment straight to the file, then fill in the
+        # count: NumPy pads .npy headers so the shape can grow in place.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_name(f"primes.{os.getpid()}.npy")
+        with open(tmp, "wb") as fh:
+            _write_header(fh, 0)
+            self.primes.tofile(fh)
+            count = len(self.primes)
+            for chunk in prime_sieve.iter_primes(limit, self.limit + 1):
+                chunk.astype(np.uint32).tofile(fh)
+                count += len(chunk)
+            fh.seek(0)
+            _write_header(fh, count)
+        os.replace(tmp, self._path)
+        meta = self.directory / "meta.json"
+        tmp = meta.with_name(f"meta.{os.getpid()}.json")
+        tmp.write_text(json.dumps({"limit": limit, "count": count}))
+        os.replace(tmp, meta)
+        self._primes = self._limit = None
+
+    def is_prime(self, n):
+        """Table lookup up to limit, else Miller-Rabin (ValueError past MR_LIMIT)."""
+        if n <= self.limit:
+            i = int(np.searchsorted(self.primes, n))
+            return i < len(self.primes) and int(self.primes[i]) == n
+        return miller_rabin(n)
+
+    def count(self, n):
+        """pi(n): from the table when it reaches n, else by Lucy's method."""
+        if n <= self.limit:
+            return int(np.searchsorted(self.primes, n, side="right"))
+        return prime_count.lucy(n)
+
+    def nth_prime(self, k):
+        """The k-th prime (nth_prime(1) == 2)."""
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        if k > len(self.primes):
+            self.extend(_upper_bound(k))
+        if k <= len(self.primes):
+            return int(self.primes[k - 1])
+        # Past the table: count up to a lower bound, then sieve forward.
+        x = max(_lower_bound(k), self.limit)
+        seen = self.count(x)
+        for chunk in prime_sieve.iter_primes(_upper_bound(k), x + 1):
+            if seen + len(chunk) >= k:
+                return int(chunk[k - seen - 1])
+            seen += len(chunk)
+        raise AssertionError("nth prime bound too small")
+
+
+def _write_header(fh, count):
+    header = {"descr": "<u4", "fortran_order": False, "shape": (count,)}
+    np.lib.format.write_array_header_1_0(fh, header)
+
+
+def _lower_bound(k):
+    # Dusart: p_k >= k (ln k + ln ln k - 1) for k >= 2.
+    if k < 6:
+        return 1
+    return int(k * (log(k) + log(log(k)) - 1))
+
+
+def _upper_bound(k):
+    # Rosser: p_k < k (ln k + ln ln k) for k >= 6.
+    if k < 6:
+        return 13
+    return int(k * (log(k) + log(log(k)))) + 1
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prime table queries.")
+    parser.add_argument("--dir", type=Path, default=TABLE_DIR, help="Table directory.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    is_prime = sub.add_parser("is-prime", help="Test numbers for primality.")
+    is_prime.add_argument("numbers", nargs="+", type=int)
+    nth = sub.add_parser("nth", help="The k-th prime.")
+    nth.add_argument("k", type=int)
+    count = sub.add_parser("count", help="Number of primes <= n.")
+    count.add_argument("n", type=int)
+    extend = sub.add_parser("extend", help="Sieve the table up to a limit.")
+    extend.add_argument("limit", type=int)
+    sub.add_parser("info", help="Table size and location.")
+    args = parser.parse_args(argv)
+    table = PrimeTable(args.dir)
+
+    start = time.time()
+    if args.command == "is-prime":
+        for n in args.numbers:
+            try:
+                print(f"{n}: {'prime' if table.is_prime(n) else 'not prime'}")
+            except ValueError as exc:
+                print(f"Error: {exc}", file=sys.stderr)
+                return 1
+    elif args.command == "nth":
+        print(table.nth_prime(args.k))
+    elif args.command == "count":
+        print(f"\nTotal prime numbers up to {args.n}: {table.count(args.n)}")
+    elif args.command == "extend":
+        table.extend(args.limit)
+        print(f"Table holds {len(table.primes)} primes up to {table.limit}")
+    else:
+        size = table._path.stat().st_size if table._path.exists() else 0
+        print(f"{table._path}: {len(table.primes)} primes up to {table.limit}")
+        print(f"{size / 2**20:.1f} MiB")
+    end = time.time()
+    print(f"Elapsed time: {end - start:.6f} seconds")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
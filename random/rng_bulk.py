@@ -0,0 +1,177 @@
+# Random number pairs and their products in bulk, reproducibly
+#
+# random_num_gen in "Day 3.py" draws two random.randint values per call from
+# the random module's global state. Here the pairs come from NumPy Generators
+# seeded through SeedSequence: the output is cut into fixed-size blocks and
+# block i always uses child stream i of the seed, so the same seed gives the
+# same numbers whether one process fills every block or a pool splits them.
+#
+#   python rng_bulk.py 100 --count 5 --seed 42
+#   python rng_bulk.py bench --count 10000000 --workers 4
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Rows per stream; changing it changes which numbers a seed produces.
+BLOCK_ROWS = 1 << 20
+
+
+def _check_range(range_max):
+    if range_max < 1:
+        raise ValueError("range_max must be at least 1")
+    if range_max > 3037000499:  # isqrt(2**63 - 1): products must fit in int64
+        raise ValueError("range_max is too large for int64 products")
+
+
+def fill_pairs(pairs, products, range_max, seed, first_block=0):
+    """Fill preallocated (n, 2) pairs and (n,) products in place.
+
+    Both arrays start at block first_block of the seed's output; values are
+    in 1..range_max like random.randint(1, range_max).
+    """
+    _check_range(range_max)
+    rows = len(pairs)
+    blocks = -(-rows // BLOCK_ROWS)
+    # Child i of the seed always feeds block i, wherever the blocks are filled.
+    streams = np.random.SeedSequence(seed).spawn(first_block + blocks)[first_block:]
+    for i, child in enumerate(streams):
+        lo, hi = i * BLOCK_ROWS, min((i + 1) * BLOCK_ROWS, rows)
+        rng = np.random.default_rng(child)
+        pairs[lo:hi] = rng.integers(1, range_max, size=(hi - lo, 2), endpoint=True)
+    np.multiply(pairs[:, 0], pairs[:, 1], out=products)
+
+
+def bulk_pairs(count, range_max, seed=None):
+    """(pairs, products) for count draws, in one process."""
+    pairs = np.empty((count, 2), dtype=np.int64)
+    products = np.empty(count, dtype=np.int64)
+    fill_pairs(pairs, products, range_max, seed)
+    return pairs, products
+
+
+def _fill_shared(args):
+    # Worker: attach to the parent's shared arrays and fill a run of blocks.
+    from multiprocessing import shared_memory
+
+    name, count, range_max, seed, first_block, last_block = args
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        buf = np.ndarray((count, 3), dtype=np.int64, buffer=shm.buf)
+        lo, hi = first_block * BLOCK_ROWS, min(last_block * BLOCK_ROWS, count)
+        view = buf[lo:hi]
+        fill_pairs(view[:, :2], view[:, 2], range_max, seed, first_block)
+        del buf, view
+    finally:
+        shm.close()
+
+
+def parallel_pairs(count, range_max, seed=None, workers=None):
+    """bulk_pairs() with the blocks filled by a process pool.
+
+    Workers write straight into shared memory, so nothing is pickled back.
+    The result is identical to bulk_pairs() for the same seed; pass a seed,
+    or the pool's workers would each pick their own.
+    """
+    from multiprocessing import shared_memory
+
+    _check_range(range_max)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    workers = workers or os.cpu_count() or 1
+    blocks = -(-count // BLOCK_ROWS)
+    if workers == 1 or blocks <= 1:
+        return bulk_pairs(count, range_max, seed)
+    # Columns: first number, second number, product.
+    shm = shared_memory.SharedMemory(create=True, size=max(1, count * 3 * 8))
+    try:
+        per_worker = -(-blocks // workers)
+        jobs = [
+            (shm.name, count, range_max, seed, b, min(b + per_worker, blocks))
+            for b in range(0, blocks, per_worker)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_fill_shared, jobs))
+        result = np.ndarray((count, 3), dtype=np.int64, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    return result[:, :2], result[:, 2]
+
+
+def _load_day3():
+    # random_num_gen lives in "Day 3.py", which has a space in its name.
+    import importlib.util
+    from pathlib import Path
+
+    path = Path(__file__).with_name("Day 3.py")
+    spec = importlib.util.spec_from_file_location("day3_random", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench(count, range_max, seed, workers):
+    day3 = _load_day3()
+    gen = day3.random_num_gen(range_max)
+    sample = min(count, 1_000_000)
+    start = time.perf_counter()
+    for _ in range(sample):
+        a, b = gen.generate_random_numbers()
+        a * b
+    per_call = (time.perf_counter() - start) / sample
+
+    timings = []
+    start = time.perf_counter()
+    pairs, products = bulk_pairs(count, range_max, seed)
+    timings.append(("bulk_pairs", time.perf_counter() - start))
+    start = time.perf_counter()
+    p_pairs, p_products = parallel_pairs(count, range_max, seed, workers)
+    label = f"parallel_pairs ({workers or os.cpu_count()} workers)"
+    timings.append((label, time.perf_counter() - start))
+    same = np.array_equal(pairs, p_pairs) and np.array_equal(products, p_products)
+
+    print(f"{count:,} pairs in 1..{range_max}, seed {seed}")
+    print(f"{'random_num_gen, per call':<34} {1 / per_call:16,.0f} pairs/s")
+    for label, seconds in timings:
+        print(f"{label:<34} {count / seconds:16,.0f} pairs/s")
+    print(f"Parallel output matches single-process output: {same}")
+    return 0 if same else 1
+
+
+def main(argv):
+    import argparse
+
+    if argv and argv[0] == "bench":
+        parser = argparse.ArgumentParser(description="Compare with random_num_gen.")
+        parser.add_argument("--count", type=int, default=10_000_000)
+        parser.add_argument("--range-max", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=12345)
+        parser.add_argument("--workers", type=int, help="Pool size (default: CPUs).")
+        args = parser.parse_args(argv[1:])
+        return bench(args.count, args.range_max, args.seed, args.workers)
+
+    parser = argparse.ArgumentParser(description="Random pairs and their products.")
+    parser.add_argument("range_max", nargs="?", type=int, help="Prompted for if omitted.")
+    parser.add_argument("--count", type=int, default=1, help="Number of pairs.")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible output.")
+    args = parser.parse_args(argv)
+    if args.range_max is None:
+        args.range_max = int(input("Press enter the max limit of the range: "))
+    try:
+        pairs, products = bulk_pairs(args.count, args.range_max, args.seed)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    for (first, second), product in zip(pairs.tolist(), products.tolist()):
+        print(
+            f"First random number is {first}, and second random number is {second}"
+            f" and the product of both is {product}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
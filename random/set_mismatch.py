@@ -0,0 +1,163 @@
+# Set mismatch (LeetCode 645) in linear time, one array or millions at once
+#
+# nums holds 1..n with one number duplicated and another one missing;
+# find_error_nums returns [duplicate, missing] like leetcode.findErrorNums,
+# but in one pass with an n-byte table and without touching nums.
+# find_error_nums_batch solves every row of an (m, n) array at once.
+#
+#   python set_mismatch.py 1 2 2 4
+#   python set_mismatch.py check
+#   python set_mismatch.py bench
+import sys
+import time
+
+import numpy as np
+
+# Rows per bincount call in the batch solver, so the count table stays small.
+BATCH_ROWS = 1 << 16
+
+
+def find_error_nums(nums):
+    """[duplicate, missing] for nums holding 1..n with one value repeated."""
+    n = len(nums)
+    seen = bytearray(n + 1)
+    duplicate = None
+    for x in nums:
+        if not 1 <= x <= n:
+            raise ValueError(f"{x} is outside 1..{n}")
+        if seen[x]:
+            if duplicate is not None:
+                raise ValueError("more than one duplicate")
+            duplicate = x
+        seen[x] = 1
+    if duplicate is None:
+        raise ValueError("no duplicate")
+    # Index 0 is never set, so search from 1; exactly one value is missing.
+    return [duplicate, seen.index(0, 1)]
+
+
+def find_error_nums_batch(rows):
+    """(m, 2) int array of [duplicate, missing] for each row of an (m, n) array."""
+    rows = np.asarray(rows)
+    if rows.ndim != 2:
+        raise ValueError("expected a 2-D array")
+    m, n = rows.shape
+    if m and (rows.min() < 1 or rows.max() > n):
+        raise ValueError(f"values must lie in 1..{n}")
+    out = np.empty((m, 2), dtype=np.int64)
+    width = n + 1
+    for lo in range(0, m, BATCH_ROWS):
+        chunk = rows[lo : lo + BATCH_ROWS]
+        k = len(chunk)
+        # Offset row i's values by i * (n + 1) so one bincount counts them all.
+        offsets = np.arange(k, dtype=np.int64)[:, None] * width
+        counts = np.bincount((chunk + offsets).ravel(), minlength=k * width)
+        counts = counts.reshape(k, width)
+        counts[:, 0] = 1  # 0 is not a candidate for the missing value
+        twice, never = counts == 2, counts == 0
+        bad = (twice.sum(axis=1) != 1) | (never.sum(axis=1) != 1)
+        if bad.any():
+            raise ValueError(f"row {lo + int(np.argmax(bad))} is not a set mismatch")
+        out[lo : lo + k, 0] = twice.argmax(axis=1)
+        out[lo : lo + k, 1] = never.argmax(axis=1)
+    return out
+
+
+def random_cases(m, n, rng):
+    """(m, n) array of shuffled set-mismatch inputs and their [dup, missing]."""
+    rows = np.tile(np.arange(1, n + 1, dtype=np.int64), (m, 1))
+    missing = rng.integers(1, n + 1, size=m)
+    # Any value other than the missing one can be the duplicate.
+    duplicate = rng.integers(1, n, size=m)
+    duplicate += duplicate >= missing
+    rows[np.arange(m), missing - 1] = duplicate
+    rows = rng.permuted(rows, axis=1)
+    return rows, np.stack([duplicate, missing], axis=1)
+
+
+def _original(nums):
+    # leetcode.findErrorNums sorts its argument and prints as it goes.
+    import contextlib
+    import io
+
+    import leetcode
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return leetcode.findErrorNums(list(nums))
+
+
+def check(trials, max_n, seed):
+    """Compare both solvers with the known answers; returns the failure count."""
+    rng = np.random.default_rng(seed)
+    failures = original_wrong = 0
+    for _ in range(trials):
+        n = int(rng.integers(2, max_n + 1))
+        rows, expected = random_cases(int(rng.integers(1, 50)), n, rng)
+        batch = find_error_nums_batch(rows)
+        for row, want, got in zip(rows.tolist(), expected.tolist(), batch.tolist()):
+            if find_error_nums(row) != want or got != want:
+                failures += 1
+                print(f"mismatch for {row}: expected {want}")
+            if _original(row) != want:
+                original_wrong += 1
+    print(f"{trials} trials: {failures} failures")
+    print(f"leetcode.findErrorNums was wrong on {original_wrong} of those inputs")
+    return failures
+
+
+def bench(n, m, seed):
+    rng = np.random.default_rng(seed)
+    rows, expected = random_cases(m, n, rng)
+    lists = rows.tolist()
+    results = []
+
+    sample = lists[: max(1, min(m, 200000 // max(n, 1)))]
+    for label, solve, cases in (
+        ("leetcode.findErrorNums", _original, sample),
+        ("find_error_nums", find_error_nums, lists),
+    ):
+        start = time.perf_counter()
+        for nums in cases:
+            solve(nums)
+        per_row = (time.perf_counter() - start) / len(cases)
+        results.append((label, per_row))
+
+    start = time.perf_counter()
+    got = find_error_nums_batch(rows)
+    results.append(("find_error_nums_batch", (time.perf_counter() - start) / m))
+    assert (got == expected).all()
+
+    print(f"{m} arrays of length {n}")
+    for label, per_row in results:
+        print(f"{label:<24} {per_row * 1e6:10.2f}us per array {1 / per_row:14,.0f}/s")
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Set mismatch solver.")
+    sub = parser.add_subparsers(dest="command")
+    check_cmd = sub.add_parser("check", help="Randomized test against known answers.")
+    check_cmd.add_argument("--trials", type=int, default=500)
+    check_cmd.add_argument("--max-n", type=int, default=30)
+    bench_cmd = sub.add_parser("bench", help="Time the solvers.")
+    bench_cmd.add_argument("--n", type=int, default=20, help="Length of each array.")
+    bench_cmd.add_argument("--rows", type=int, default=1_000_000, help="Number of arrays.")
+    for cmd in (check_cmd, bench_cmd):
+        cmd.add_argument("--seed", type=int, default=0)
+    if argv and argv[0] not in ("check", "bench", "-h", "--help"):
+        nums = [int(x) for x in argv]
+        print(find_error_nums(nums))
+        return 0
+    args = parser.parse_args(argv)
+    if args.command == "check":
+        return 1 if check(args.trials, args.max_n, args.seed) else 0
+    if args.command == "bench":
+        bench(args.n, args.rows, args.seed)
+        return 0
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
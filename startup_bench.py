@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Cold-start latency budget for the project's command-line entry points.
+
+Each command is launched several times in a fresh interpreter and its median
+wall time is compared against a budget. One extra run under `-X importtime`
+shows which imports dominate. Exits non-zero when any command is over budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True)
+class Command:
+    """One CLI invocation and how long it may take to start."""
+
+    name: str
+    args: tuple[str, ...]
+    cwd: Path
+    budget_ms: float
+    stdin: str = ""
+
+
+# Budgets are wall time for the whole process, interpreter start included,
+# with some headroom over a typical laptop; the point is to catch an eager
+# import of something heavy (urllib.request alone is ~40ms), not to chase
+# single milliseconds. Use --scale on slower machines.
+COMMANDS = (
+    Command("weather --help", ("weather.py", "--help"), ROOT / ".vscode", 100),
+    Command("notes (menu, exit)", ("Notes.py",), ROOT / "NotesApp", 80, stdin="0\n"),
+    Command("notes gui (import)", ("-c", "import gui"), ROOT / "NotesApp", 150),
+    Command("study status", ("comp_sci", "status"), ROOT / "study_tracker", 100),
+    Command(
+        "study status (direct)",
+        ("tracker.py", "--subject", "comp_sci", "status"),
+        ROOT / "study_tracker",
+        120,
+    ),
+)
+
+
+def time_once(command: Command) -> float:
+    """Run the command once and return its wall time in milliseconds."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *command.args],
+        cwd=command.cwd,
+        input=command.stdin,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def import_profile(command: Command, top: int) -> list[tuple[float, str]]:
+    """Return the `top` slowest top-level imports as (cumulative ms, module)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *command.args],
+        cwd=command.cwd,
+        input=command.stdin,
+        capture_output=True,
+        text=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        # Only top-level imports; nested ones are counted in their parent.
+        if module.startswith("  "):
+            continue
+        imports.append((int(cumulative) / 1000, module.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Launches per command (median is used)."
+    )
+    parser.add_argument(
+        "--top", type=int, default=3, help="Slowest imports to list per command."
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply every budget, e.g. 2 on a slow CI machine.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    failures = 0
+    print(f"{'command':<24} {'median':>8} {'budget':>8}  status")
+    for command in COMMANDS:
+        budget = command.budget_ms * args.scale
+        try:
+            time_once(command)  # warm the OS file cache, not the interpreter
+            samples = [time_once(command) for _ in range(max(1, args.runs))]
+        except subprocess.CalledProcessError as exc:
+            status = f"ERROR (exit {exc.returncode})"
+            print(f"{command.name:<24} {'-':>8} {budget:>6.0f}ms  {status}")
+            failures += 1
+            continue
+        median = statistics.median(samples)
+        ok = median <= budget
+        failures += not ok
+        status = "ok" if ok else "OVER BUDGET"
+        print(f"{command.name:<24} {median:>6.1f}ms {budget:>6.0f}ms  {status}")
+        for cumulative, module in import_profile(command, args.top):
+            print(f"{'':<26}{cumulative:>6.1f}ms  import {module}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,133 @@
+"""Vectorized study statistics over a subject's daily_totals history (needs NumPy)."""
+from __future__ import annotations
+import csv
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+@dataclass
+class Analysis:
+    first_day: date
+    hours: np.ndarray
+    rolling_7: np.ndarray
+    rolling_30: np.ndarray
+    cumulative: np.ndarray
+    current_streak: int
+    longest_streak: int
+    weekday_hours: np.ndarray
+    weekday_days: np.ndarray
+    goal_hours: float
+    projected_30: Optional[date]
+    projected_all: Optional[date]
+    @property
+    def last_day(self) -> date:
+        return self.first_day + timedelta(days=len(self.hours) - 1)
+def dense_hours(daily_totals: Dict[str, float], end: date) -> tuple[date, np.ndarray]:
+    # One slot per calendar day from the first logged day through `end`.
+    days = np.array(
+        [date.fromisoformat(day).toordinal() for day in daily_totals], dtype=np.int64
+    )
+    seconds = np.fromiter(daily_totals.values(), dtype=np.float64, count=len(days))
+    first = int(days.min())
+    length = max(end.toordinal(), int(days.max())) - first + 1
+    hours = np.bincount(days - first, weights=seconds / 3600, minlength=length)
+    return date.fromordinal(first), hours
+def _rolling_mean(cumulative: np.ndarray, window: int) -> np.ndarray:
+    # Mean over the trailing `window` days (fewer at the start of the history).
+    padded = np.concatenate(([0.0], cumulative))
+    idx = np.arange(1, len(padded))
+    start = np.maximum(idx - window, 0)
+    return (padded[idx] - padded[start]) / np.minimum(idx, window)
+def _streaks(studied: np.ndarray) -> tuple[int, int]:
+    # Run lengths of consecutive study days, found from the edges of each run.
+    edges = np.diff(np.concatenate(([0], studied.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if not len(starts):
+        return 0, 0
+    lengths = ends - starts
+    # A streak is still current if it reaches today or yesterday.
+    current = int(lengths[-1]) if ends[-1] >= len(studied) - 1 else 0
+    return current, int(lengths.max())
+def _projection(remaining: float, per_day: float, today: date) -> Optional[date]:
+    if remaining <= 0:
+        return today
+    if per_day <= 0:
+        return None
+    try:
+        return today + timedelta(days=int(np.ceil(remaining / per_day)))
+    except OverflowError:
+        return None
+def analyze(
+    daily_totals: Dict[str, float], goal_hours: float, today: date
+) -> Optional[Analysis]:
+    if not daily_totals:
+        return None
+    first_day, hours = dense_hours(daily_totals, today)
+    cumulative = np.cumsum(hours)
+    rolling_7 = _rolling_mean(cumulative, 7)
+    rolling_30 = _rolling_mean(cumulative, 30)
+    current, longest = _streaks(hours > 0)
+    weekday = (first_day.weekday() + np.arange(len(hours))) % 7
+    weekday_hours = np.bincount(weekday, weights=hours, minlength=7)
+    weekday_days = np.bincount(weekday, weights=(hours > 0), minlength=7)
+    remaining = goal_hours - float(cumulative[-1])
+    all_time_pace = float(cumulative[-1]) / len(hours)
+    return Analysis(
+        first_day=first_day,
+        hours=hours,
+        rolling_7=rolling_7,
+        rolling_30=rolling_30,
+        cumulative=cumulative,
+        current_streak=current,
+        longest_streak=longest,
+        weekday_hours=weekday_hours,
+        weekday_days=weekday_days,
+        goal_hours=goal_hours,
+        projected_30=_projection(remaining, float(rolling_30[-1]), today),
+        projected_all=_projection(remaining, all_time_pace, today),
+    )
+def format_analysis(name: str, result: Analysis) -> str:
+    total = float(result.cumulative[-1])
+    lines = [
+        f"Study analytics for {name} ({result.first_day} to {result.last_day})",
+        "-" * 40,
+        f"Total logged:        {total:.2f}h over {int((result.hours > 0).sum())} study days",
+        f"Current streak:      {result.current_streak} days",
+        f"Longest streak:      {result.longest_streak} days",
+        f"7-day average:       {result.rolling_7[-1]:.2f}h/day",
+        f"30-day average:      {result.rolling_30[-1]:.2f}h/day",
+        f"All-time average:    {total / len(result.hours):.2f}h/day",
+    ]
+    for label, projected in (
+        ("30-day pace", result.projected_30),
+        ("all-time pace", result.projected_all),
+    ):
+        when = projected.isoformat() if projected else "never at this pace"
+        lines.append(f"{result.goal_hours:g}h goal at {label + ':':<14} {when}")
+    lines.append("\nBy weekday:")
+    share = result.weekday_hours / total if total else np.zeros(7)
+    for idx, label in enumerate(WEEKDAYS):
+        lines.append(
+            f"  {label}: {result.weekday_hours[idx]:8.2f}h "
+            f"({share[idx]:5.1%}, {int(result.weekday_days[idx])} days)"
+        )
+    return "\n".join(lines)
+def write_csv(path: Path, result: Analysis) -> None:
+    days = [
+        (result.first_day + timedelta(days=i)).isoformat()
+        for i in range(len(result.hours))
+    ]
+    columns: List[np.ndarray] = [
+        result.hours,
+        result.rolling_7,
+        result.rolling_30,
+        result.cumulative,
+    ]
+    rounded = np.round(np.column_stack(columns), 4).tolist()
+    with path.open("w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["date", "hours", "rolling_7", "rolling_30", "cumulative"])
+        writer.writerows([day, *row] for day, row in zip(days, rounded))
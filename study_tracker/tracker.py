@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""Hour-tracking clock for any number of subjects, each toward a 10,000 hour goal."""
+from __future__ import annotations
+import json
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+GOAL_HOURS = 10_000
+# Each subject keeps <name>.json (snapshot) and <name>.log (event log) here.
+DATA_DIR = Path(__file__).resolve().parent
+# Commands append events to the log; the snapshot is only rewritten every
+# SNAPSHOT_EVERY events, when the log is folded into it.
+SNAPSHOT_EVERY = 64
+HEAD_KEYS = (
+    "seq",
+    "total_seconds",
+    "session_start",
+    "session_date",
+    "last_day",
+    "last_day_seconds",
+)
+def _now() -> datetime:
+    return datetime.now()
+def _format_hours(seconds: float) -> str:
+    return f"{seconds / 3600:.2f}h"
+def _week_key(day: date) -> int:
+    return day.toordinal() - day.weekday()
+def _month_key(day: date) -> int:
+    return day.year * 12 + day.month - 1
+class _Series:
+    # Sorted integer keys with a running (cumulative) sum, so the total over
+    # any key range is two bisections and a subtraction.
+    def __init__(self) -> None:
+        self.keys: List[int] = []
+        self.values: List[float] = []
+        self.cumulative: List[float] = [0.0]
+    def add(self, key: int, seconds: float) -> None:
+        if self.keys and key == self.keys[-1]:
+            self.values[-1] += seconds
+            self.cumulative[-1] += seconds
+        elif not self.keys or key > self.keys[-1]:
+            self.keys.append(key)
+            self.values.append(seconds)
+            self.cumulative.append(self.cumulative[-1] + seconds)
+        else:
+            # Out-of-order day (clock went backwards): rebuild the prefix sums.
+            idx = bisect_left(self.keys, key)
+            if idx < len(self.keys) and self.keys[idx] == key:
+                self.values[idx] += seconds
+            else:
+                self.keys.insert(idx, key)
+                self.values.insert(idx, seconds)
+            self.cumulative = [0.0]
+            for value in self.values:
+                self.cumulative.append(self.cumulative[-1] + value)
+    def between(self, lo: int, hi: int) -> float:
+        return self.cumulative[bisect_right(self.keys, hi)] - self.cumulative[
+            bisect_left(self.keys, lo)
+        ]
+    def get(self, key: int) -> float:
+        idx = bisect_left(self.keys, key)
+        if idx < len(self.keys) and self.keys[idx] == key:
+            return self.values[idx]
+        return 0.0
+class RollupIndex:
+    """Daily, weekly and monthly totals with cumulative indexes.
+    Built once from daily_totals in O(n); range and period queries are then
+    O(log n), and logging a new session on the newest day is O(1).
+    """
+    def __init__(self, daily_totals: Optional[Dict[str, float]] = None) -> None:
+        self.daily = _Series()
+        self.weekly = _Series()
+        self.monthly = _Series()
+        for day in sorted(daily_totals or {}):
+            self.add(day, daily_totals[day])
+    def add(self, day: str, seconds: float) -> None:
+        parsed = date.fromisoformat(day)
+        self.daily.add(parsed.toordinal(), seconds)
+        self.weekly.add(_week_key(parsed), seconds)
+        self.monthly.add(_month_key(parsed), seconds)
+    def total(self, start: Optional[date], end: Optional[date]) -> float:
+        lo = start.toordinal() if start else 0
+        hi = end.toordinal() if end else date.max.toordinal()
+        return self.daily.between(lo, hi)
+    def day(self, day: date) -> float:
+        return self.daily.get(day.toordinal())
+    def week(self, day: date) -> float:
+        return self.weekly.get(_week_key(day))
+    def month(self, day: date) -> float:
+        return self.monthly.get(_month_key(day))
+class Subject:
+    """One tracked subject and its snapshot/event-log files.
+    A resident owner (trackerd) passes `persist`, an object with submit(job)
+    and flush(); the head is then kept in memory and writes happen in the
+    background. Without it every write is synchronous and nothing is cached.
+    """
+    def __init__(
+        self, name: str, data_dir: Path = DATA_DIR, persist: Any = None
+    ) -> None:
+        self.name = name
+        self.state_file = data_dir / f"{name}.json"
+        self.log_file = data_dir / f"{name}.log"
+        self.persist = persist
+        self._head: Optional[Dict[str, Any]] = None
+        self._rollups: Optional[RollupIndex] = None
+    def _empty_state(self) -> Dict[str, Any]:
+        return {
+            "total_seconds": 0.0,
+            "session_start": None,
+            "session_date": None,
+            "daily_totals": {},
+            "log_seq": 0,
+        }
+    def _load_snapshot(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        if self.state_file.exists():
+            with self.state_file.open("r", encoding="utf-8") as fh:
+                try:
+                    data = json.load(fh)
+                except json.JSONDecodeError:
+                    data = {}
+        for key, value in self._empty_state().items():
+            data.setdefault(key, value)
+        return data
+    def _read_log(self) -> List[Dict[str, Any]]:
+        if not self.log_file.exists():
+            return []
+        records = []
+        with self.log_file.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A write torn by a crash; the records around it are intact.
+                    continue
+        return records
+    def _read_last_record(self) -> Optional[Dict[str, Any]]:
+        # Scan back from the end so the cost does not grow with the log.
+        if not self.log_file.exists():
+            return None
+        with self.log_file.open("rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            end = fh.tell()
+            block = 4096
+            while True:
+                start = max(0, end - block)
+                fh.seek(start)
+                lines = fh.read(end - start).splitlines()
+                # The first line may be cut off unless we read from the start.
+                complete = lines if start == 0 else lines[1:]
+                for line in reversed(complete):
+                    try:
+                        return json.loads(line)
+                    except ValueError:
+                        continue
+                if start == 0:
+                    return None
+                block *= 2
+    def load_head(self) -> Dict[str, Any]:
+        if self._head is None:
+            head = self._read_head()
+            if self.persist is None:
+                return head
+            self._head = head
+        return dict(self._head)
+    def _read_head(self) -> Dict[str, Any]:
+        # Every log record carries the running totals start/stop/status need,
+        # so reading the last line is enough; before the first event, use the
+        # snapshot.
+        record = self._read_last_record()
+        if record is not None:
+            return {key: record.get(key) for key in HEAD_KEYS}
+        state = self._load_snapshot()
+        daily = state["daily_totals"]
+        last_day = max(daily) if daily else None
+        return {
+            "seq": state["log_seq"],
+            "total_seconds": state["total_seconds"],
+            "session_start": state["session_start"],
+            "session_date": state["session_date"],
+            "last_day": last_day,
+            "last_day_seconds": daily.get(last_day, 0.0) if last_day else 0.0,
+        }
+    def load_state(self) -> Dict[str, Any]:
+        state = self._load_snapshot()
+        records = [
+            r for r in self._read_log() if r.get("seq", 0) > state["log_seq"]
+        ]
+        daily = state["daily_totals"]
+        for record in records:
+            if record.get("event") == "stop":
+                day = record["day"]
+                daily[day] = daily.get(day, 0.0) + record["elapsed"]
+        if records:
+            last = records[-1]
+            state["total_seconds"] = last["total_seconds"]
+            state["session_start"] = last["session_start"]
+            state["session_date"] = last["session_date"]
+            state["log_seq"] = last["seq"]
+        return state
+    def rollups(self) -> RollupIndex:
+        if self._rollups is None:
+            if self.persist is not None:
+                self.persist.flush()
+            self._rollups = RollupIndex(self.load_state()["daily_totals"])
+        return self._rollups
+    def _write_atomic(self, path: Path, text: str) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    def _append_event(self, head: Dict[str, Any], event: Dict[str, Any]) -> None:
+        head["seq"] = (head.get("seq") or 0) + 1
+        record = dict(event, **head)
+        if self.persist is None:
+            self._write_record(record)
+            return
+        self._head = dict(head)
+        self.persist.submit(lambda: self._write_record(record))
+    def _write_record(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self.log_file.open("a+b") as fh:
+            fh.seek(0, os.SEEK_END)
+            if fh.tell():
+                fh.seek(-1, os.SEEK_END)
+                if fh.read(1) != b"\n":
+                    # Terminate a record torn by an earlier crash.
+                    fh.write(b"\n")
+            fh.write(line.encode("utf-8"))
+            fh.flush()
+            os.fsync(fh.fileno())
+        # A subject's first event also writes its snapshot, so every subject
+        # has both files and list_subjects() can require the pair.
+        if record["seq"] % SNAPSHOT_EVERY == 0 or not self.state_file.exists():
+            self._compact()
+    def _compact(self) -> None:
+        # The snapshot records the last folded seq, so a crash between these
+        # two writes never replays an event twice.
+        state = self.load_state()
+        head = self._read_head()
+        snapshot = json.dumps(state, indent=2, sort_keys=True)
+        self._write_atomic(self.state_file, snapshot)
+        checkpoint = json.dumps(dict({"event": "checkpoint"}, **head), sort_keys=True)
+        self._write_atomic(self.log_file, checkpoint + "\n")
+    def start_session(self) -> int:
+        head = self.load_head()
+        if head["session_start"] is not None:
+            print("Study clock already running.")
+            return 1
+        now = _now()
+        head["session_start"] = now.timestamp()
+        head["session_date"] = now.date().isoformat()
+        self._append_event(head, {"event": "start", "ts": now.timestamp()})
+        print(f"Started study session at {now.strftime('%H:%M:%S')}.")
+        return 0
+    def stop_session(self) -> int:
+        head = self.load_head()
+        start_ts = head.get("session_start")
+        if start_ts is None:
+            print("Study clock is not running.")
+            return 1
+        now = _now()
+        elapsed = max(0.0, now.timestamp() - float(start_ts))
+        head["total_seconds"] += elapsed
+        day = head.get("session_date") or now.date().isoformat()
+        if head["last_day"] is None or day >= head["last_day"]:
+            previous = head["last_day_seconds"] if day == head["last_day"] else 0.0
+            day_seconds = previous + elapsed
+            head["last_day"] = day
+            head["last_day_seconds"] = day_seconds
+        else:
+            # Sessions normally end on or after the newest logged day; if the
+            # clock went backwards, look the day up in the full history.
+            day_seconds = self.rollups().day(date.fromisoformat(day)) + elapsed
+        head["session_start"] = None
+        head["session_date"] = None
+        event = {"event": "stop", "ts": now.timestamp(), "day": day}
+        self._append_event(head, dict(event, elapsed=elapsed))
+        if self._rollups is not None:
+            self._rollups.add(day, elapsed)
+        remaining_hours = max(0.0, GOAL_HOURS - head["total_seconds"] / 3600)
+        print(
+            f"Session logged: {_format_hours(elapsed)} today "
+            f"({day} total: {_format_hours(day_seconds)})."
+        )
+        print(
+            f"Progress: {_format_hours(head['total_seconds'])} studied, "
+            f"{remaining_hours:.2f}h remaining toward {GOAL_HOURS}h goal."
+        )
+        return 0
+    def show_status(self) -> int:
+        head = self.load_head()
+        now = _now()
+        today_key = now.date().isoformat()
+        today_seconds = 0.0
+        if head["last_day"] == today_key:
+            today_seconds = head["last_day_seconds"]
+        if head.get("session_start"):
+            in_progress = max(0.0, now.timestamp() - float(head["session_start"]))
+            if head.get("session_date") == today_key:
+                today_seconds += in_progress
+            print(
+                f"Session in progress for {_format_hours(in_progress)} "
+                f"(started {datetime.fromtimestamp(head['session_start']).strftime('%H:%M:%S')})."
+            )
+        else:
+            print("No active study session.")
+        total_seconds = head["total_seconds"]
+        if head.get("session_start"):
+            total_seconds += max(0.0, now.timestamp() - float(head["session_start"]))
+        remaining_hours = max(0.0, GOAL_HOURS - total_seconds / 3600)
+        print(f"Today's study time: {_format_hours(today_seconds)}.")
+        print(
+            f"Overall: {_format_hours(total_seconds)} completed, "
+            f"{remaining_hours:.2f}h remaining toward {GOAL_HOURS}h."
+        )
+        return 0
+    def show_total(self, start: Optional[date], end: Optional[date]) -> int:
+        seconds = self.rollups().total(start, end)
+        span = f"{start or 'the beginning'} to {end or 'today'}"
+        print(f"{self.name}: {_format_hours(seconds)} from {span}.")
+        return 0
+    def reset_progress(self) -> int:
+        if self.persist is not None:
+            self.persist.flush()
+        self.state_file.unlink(missing_ok=True)
+        self.log_file.unlink(missing_ok=True)
+        self._head = None
+        self._rollups = None
+        print("Study progress reset.")
+        return 0
+    def interactive_prompt(self) -> int:
+        self.show_status()
+        head = self.load_head()
+        if head.get("session_start"):
+            start_time = datetime.fromtimestamp(float(head["session_start"]))
+            if _prompt_yes_no(
+                f"Study clock has been running since {start_time.strftime('%H:%M:%S')}. Stop it now?"
+            ):
+                return self.stop_session()
+            return 0
+        if _prompt_yes_no("No session running. Start studying now?"):
+            return self.start_session()
+        return 0
+def _prompt_yes_no(question: str) -> bool:
+    try:
+        reply = input(f"{question} [Y/N]: ").strip().lower()
+    except EOFError:
+        return False
+    return reply in {"y", "yes"}
+def list_subjects(data_dir: Path = DATA_DIR) -> List[str]:
+    # Only a <name>.json snapshot paired with a <name>.log event log is a
+    # subject; any other .json or .log file in the directory is ignored.
+    logs = {path.stem for path in data_dir.glob("*.log")}
+    return sorted(path.stem for path in data_dir.glob("*.json") if path.stem in logs)
+def show_dashboard(
+    subjects: List[Subject], start: Optional[date], end: Optional[date]
+) -> int:
+    if not subjects:
+        print("No subjects tracked yet.")
+        return 0
+    today = _now().date()
+    rows: List[Tuple[str, ...]] = []
+    for subject in subjects:
+        rollups = subject.rollups()
+        row = [
+            subject.name,
+            _format_hours(rollups.day(today)),
+            _format_hours(rollups.week(today)),
+            _format_hours(rollups.month(today)),
+        ]
+        if start or end:
+            row.append(_format_hours(rollups.total(start, end)))
+        row.append(_format_hours(subject.load_head()["total_seconds"]))
+        rows.append(tuple(row))
+    header = ["Subject", "Today", "Week", "Month"]
+    if start or end:
+        header.append(f"{start or '...'}..{end or '...'}")
+    header.append("Total")
+    widths = [max(len(cell) for cell in column) for column in zip(header, *rows)]
+    for row in [tuple(header)] + rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    return 0
+def show_analysis(subjects: List[Subject], csv_path: Optional[Path]) -> int:
+    try:
+        import analytics
+    except ImportError:
+        print("The analyze command needs NumPy (pip install numpy).")
+        return 1
+    daily: Dict[str, float] = {}
+    for subject in subjects:
+        for day, seconds in subject.load_state()["daily_totals"].items():
+            daily[day] = daily.get(day, 0.0) + seconds
+    goal = GOAL_HOURS * len(subjects)
+    result = analytics.analyze(daily, goal, _now().date())
+    if result is None:
+        print("No study sessions logged yet.")
+        return 0
+    name = subjects[0].name if len(subjects) == 1 else "all subjects"
+    print(analytics.format_analysis(name, result))
+    if csv_path is not None:
+        analytics.write_csv(csv_path, result)
+        print(f"\nWrote per-day stats to {csv_path}.")
+    return 0
+def _parse_day(text: str) -> date:
+    import argparse
+    try:
+        return date.fromisoformat(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, not {text!r}") from exc
+def main(
+    argv: list[str], subject: Optional[str] = None, via_daemon: bool = True
+) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Track study hours toward a fixed goal."
+    )
+    if subject is None:
+        parser.add_argument(
+            "--subject", "-s", default="study", help="Subject to track."
+        )
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("start", help="Start the study clock.")
+    sub.add_parser("stop", help="Stop the study clock and log the session.")
+    sub.add_parser("status", help="Show progress toward the goal.")
+    sub.add_parser("reset", help="Delete saved progress.")
+    total = sub.add_parser("total", help="Show hours logged over a date range.")
+    dash = sub.add_parser("dashboard", help="Compare hours across all subjects.")
+    analyze = sub.add_parser(
+        "analyze", help="Streaks, rolling averages and goal projection (needs NumPy)."
+    )
+    analyze.add_argument("--csv", type=Path, help="Also write per-day stats to CSV.")
+    analyze.add_argument(
+        "--all", action="store_true", help="Combine every tracked subject."
+    )
+    for cmd in (total, dash):
+        cmd.add_argument(
+            "--from", dest="start", type=_parse_day, help="First day (YYYY-MM-DD)."
+        )
+        cmd.add_argument(
+            "--to", dest="end", type=_parse_day, help="Last day (YYYY-MM-DD)."
+        )
+    args = parser.parse_args(argv)
+    name = subject or args.subject
+    if via_daemon:
+        # A running trackerd owns the files; let it handle what it serves.
+        import trackerc
+        if args.command is None:
+            code = trackerc.interactive(name)
+            if code is not None:
+                return code
+        elif args.command in trackerc.DAEMON_COMMANDS:
+            reply = trackerc.request(name, args.command)
+            if reply is not None:
+                sys.stdout.write(reply[1])
+                return reply[0]
+    current = Subject(name)
+    if args.command is None:
+        return current.interactive_prompt()
+    if args.command == "start":
+        return current.start_session()
+    if args.command == "stop":
+        return current.stop_session()
+    if args.command == "status":
+        return current.show_status()
+    if args.command == "reset":
+        return current.reset_progress()
+    if args.command == "total":
+        return current.show_total(args.start, args.end)
+    if args.command == "dashboard":
+        subjects = [Subject(name) for name in list_subjects()]
+        return show_dashboard(subjects, args.start, args.end)
+    if args.command == "analyze":
+        subjects = [Subject(n) for n in list_subjects()] if args.all else [current]
+        return show_analysis(subjects, args.csv)
+    return 1
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,77 @@
+"""Thin study-tracker client: ask a running trackerd, else run tracker.py directly."""
+import os
+import socket
+import sys
+# Commands the daemon answers; anything else always runs in-process.
+DAEMON_COMMANDS = {"start", "stop", "status", "reset"}
+def socket_path() -> str:
+    here = os.path.dirname(os.path.abspath(__file__))
+    return os.environ.get("STUDY_TRACKER_SOCKET", os.path.join(here, ".trackerd.sock"))
+def request(subject: str, command: str, timeout: float = 5.0):
+    # Returns (exit code, output), or None when no daemon is listening.
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path())
+            sock.sendall(f"{subject}\t{command}\n".encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    code, _, output = b"".join(chunks).decode("utf-8").partition("\n")
+    try:
+        return int(code), output
+    except ValueError:
+        return None
+def _prompt_yes_no(question: str) -> bool:
+    try:
+        reply = input(f"{question} [Y/N]: ").strip().lower()
+    except EOFError:
+        return False
+    return reply in {"y", "yes"}
+def interactive(subject: str):
+    # The no-argument prompt, driven through the daemon; None if it is down.
+    reply = request(subject, "status")
+    if reply is None:
+        return None
+    sys.stdout.write(reply[1])
+    session = request(subject, "session")
+    if session is None:
+        return None
+    code, started = session
+    if code == 0:
+        if _prompt_yes_no(
+            f"Study clock has been running since {started.strip()}. Stop it now?"
+        ):
+            command = "stop"
+        else:
+            return 0
+    elif _prompt_yes_no("No session running. Start studying now?"):
+        command = "start"
+    else:
+        return 0
+    reply = request(subject, command)
+    if reply is None:
+        return None
+    sys.stdout.write(reply[1])
+    return reply[0]
+def run(subject: str, argv: list) -> int:
+    if len(argv) == 1 and argv[0] in DAEMON_COMMANDS:
+        reply = request(subject, argv[0])
+        if reply is not None:
+            sys.stdout.write(reply[1])
+            return reply[0]
+    elif not argv:
+        code = interactive(subject)
+        if code is not None:
+            return code
+    # No daemon (or a command it does not serve): fall back to direct file mode.
+    import tracker
+    return tracker.main(argv, subject=subject, via_daemon=False)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Resident study-tracker daemon serving start/stop/status over a Unix socket."""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from datetime import datetime
+from typing import Callable, Dict
+import tracker
+import trackerc
+class Persister:
+    """Runs file writes on a background thread, in submission order."""
+    def __init__(self) -> None:
+        self._jobs: "queue.Queue[Callable[[], None] | None]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    def submit(self, job: Callable[[], None]) -> None:
+        self._jobs.put(job)
+    def flush(self) -> None:
+        self._jobs.join()
+    def close(self) -> None:
+        self._jobs.put(None)
+        self._thread.join()
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                job()
+            except Exception as exc:  # keep serving; the log line is lost
+                print(f"trackerd: write failed: {exc}", file=sys.stderr)
+            finally:
+                self._jobs.task_done()
+class TrackerDaemon(socketserver.UnixStreamServer):
+    """Keeps every subject's head in memory; one request at a time."""
+    def __init__(self, path: str) -> None:
+        self.persister = Persister()
+        self.subjects: Dict[str, tracker.Subject] = {}
+        super().__init__(path, RequestHandler)
+    def subject(self, name: str) -> tracker.Subject:
+        if name not in self.subjects:
+            self.subjects[name] = tracker.Subject(name, persist=self.persister)
+        return self.subjects[name]
+    def handle_command(self, name: str, command: str) -> tuple[int, str]:
+        subject = self.subject(name)
+        if command == "session":
+            start = subject.load_head().get("session_start")
+            if start is None:
+                return 1, ""
+            return 0, datetime.fromtimestamp(float(start)).strftime("%H:%M:%S")
+        actions = {
+            "start": subject.start_session,
+            "stop": subject.stop_session,
+            "status": subject.show_status,
+            "reset": subject.reset_progress,
+        }
+        if command not in actions:
+            return 2, f"Unknown command: {command}\n"
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            code = actions[command]()
+        return code, output.getvalue()
+    def server_close(self) -> None:
+        super().server_close()
+        self.persister.close()
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline().decode("utf-8").rstrip("\n")
+        if not line:
+            # A liveness probe (see _claim_socket) sends nothing.
+            return
+        name, _, command = line.partition("\t")
+        if not name or os.sep in name or name.startswith("."):
+            code, output = 2, f"Invalid subject: {name!r}\n"
+        else:
+            code, output = self.server.handle_command(name, command)
+        with contextlib.suppress(BrokenPipeError):
+            self.wfile.write(f"{code}\n{output}".encode("utf-8"))
+def _claim_socket(path: str) -> bool:
+    # Remove a stale socket file; refuse if a live daemon already answers.
+    if not os.path.exists(path):
+        return True
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return True
+    finally:
+        probe.close()
+    return False
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Keep study-tracker state in memory and serve the fast commands."
+    )
+    parser.add_argument(
+        "--socket", default=trackerc.socket_path(), help="Unix socket to listen on."
+    )
+    args = parser.parse_args(argv)
+    if not hasattr(socket, "AF_UNIX"):
+        print("trackerd needs Unix domain sockets.", file=sys.stderr)
+        return 1
+    if not _claim_socket(args.socket):
+        print(f"trackerd is already running on {args.socket}.", file=sys.stderr)
+        return 1
+    server = TrackerDaemon(args.socket)
+    def _stop(signum: int, frame: object) -> None:
+        # shutdown() waits for serve_forever(), so it cannot run on this thread.
+        threading.Thread(target=server.shutdown).start()
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    print(f"trackerd listening on {args.socket}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(args.socket)
+    return 0
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))